@@ -1,14 +1,31 @@
 import bcrypt
+import os
 import re
 from typing import Tuple, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
-def hash_password(password: str) -> str:
+# bcrypt work factor; pick a per-host value with benchmark_cost.py
+BCRYPT_COST = int(os.getenv('BCRYPT_COST', '12'))
+
+# Validation patterns, compiled once at import
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_]+$')
+_UPPER_RE = re.compile(r'[A-Z]')
+_LOWER_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+# All password rules in one pass; only failures fall back to the per-rule checks
+_STRONG_PASSWORD_RE = re.compile(
+    r'^(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*[!@#$%^&*(),.?":{}|<>]).{8,}',
+    re.DOTALL
+)
+
+def hash_password(password: str, cost: int = BCRYPT_COST) -> str:
     """Hash a password using bcrypt"""
     try:
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=cost)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     except Exception as e:
@@ -23,25 +40,40 @@ def verify_password(password: str, hashed_password: str) -> bool:
         logger.error(f"Error verifying password: {str(e)}")
         return False
 
+def needs_rehash(hashed_password: str, cost: int = BCRYPT_COST) -> bool:
+    """Check whether a stored hash was made with a lower cost than the current one"""
+    try:
+        # Hashes look like $2b$12$<salt+digest>
+        return int(hashed_password.split('$')[2]) < cost
+    except (IndexError, ValueError):
+        return False
+
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    # Cheap structural checks reject most malformed input before the regex runs
+    if not 5 <= len(email) <= 254:
+        return False
+    at = email.rfind('@')
+    if at < 1 or '.' not in email[at + 1:]:
+        return False
+    return bool(_EMAIL_RE.match(email))
 
 def validate_password(password: str) -> Tuple[bool, Optional[str]]:
     """
     Validate password strength
     Returns: (is_valid, error_message)
     """
+    if _STRONG_PASSWORD_RE.match(password):
+        return True, None
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
-    if not re.search(r'[A-Z]', password):
+    if not _UPPER_RE.search(password):
         return False, "Password must contain at least one uppercase letter"
-    if not re.search(r'[a-z]', password):
+    if not _LOWER_RE.search(password):
         return False, "Password must contain at least one lowercase letter"
-    if not re.search(r'\d', password):
+    if not _DIGIT_RE.search(password):
         return False, "Password must contain at least one number"
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if not _SPECIAL_RE.search(password):
         return False, "Password must contain at least one special character"
     return True, None
 
@@ -52,6 +84,6 @@ def validate_username(username: str) -> Tuple[bool, Optional[str]]:
     """
     if len(username) < 3:
         return False, "Username must be at least 3 characters long"
-    if not re.match(r'^[a-zA-Z0-9_]+$', username):
+    if not _USERNAME_RE.match(username):
         return False, "Username can only contain letters, numbers, and underscores"
     return True, None 
\ No newline at end of file
@@ -1,23 +1,105 @@
 import flet as ft
 from flet_core import colors
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import os
+import threading
 from database.db_connection import DatabaseConnection
 from authentication.auth_utils import (
-    hash_password, verify_password, validate_email,
+    hash_password, verify_password, needs_rehash, validate_email,
     validate_password, validate_username
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
+LOGO_SRC = "assets/images/System_Logo.png"
+
+def create_logo() -> ft.Image:
+    """
+    Create the auth page logo. A control can only have one parent, so each
+    layout gets its own Image; sharing LOGO_SRC lets the client decode the
+    asset once and serve the second view from its image cache.
+    """
+    return ft.Image(
+        src=LOGO_SRC,
+        width=400,
+        height=400,
+        fit=ft.ImageFit.CONTAIN,
+        error_content=ft.Text("Logo not found", color=colors.RED)
+    )
+
+# last_login writes are batched: flushed this many seconds after the first
+# pending login, or as soon as this many logins are queued
+LOGIN_FLUSH_INTERVAL = 5.0
+LOGIN_FLUSH_SIZE = 50
+
 class AuthView:
     def __init__(self, page: ft.Page, db: DatabaseConnection):
         self.page = page
         self.db = db
         self.current_user = None
+        # bcrypt releases the GIL, so hashing runs here without blocking the UI
+        self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        # Verified against when a username is unknown, so failed logins take
+        # the same time whether or not the account exists
+        self._dummy_hash = self._executor.submit(hash_password, os.urandom(16).hex())
+        # Auth layouts are built once and reset on each visit
+        self._login_layout = None
+        self._signup_layout = None
+        self._form_fields = []
+        self._error_texts = []
+        # User ids whose last_login is waiting to be written
+        self._pending_logins = set()
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        atexit.register(self.flush_logins)
         logger.info("AuthView initialized")
         
+    def record_login(self, user_id: int):
+        """Queue a last_login update instead of writing it on the login path"""
+        with self._pending_lock:
+            self._pending_logins.add(user_id)
+            flush_now = len(self._pending_logins) >= LOGIN_FLUSH_SIZE
+            if not flush_now and self._flush_timer is None:
+                self._flush_timer = threading.Timer(LOGIN_FLUSH_INTERVAL, self.flush_logins)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if flush_now:
+            self.flush_logins()
+        
+    def flush_logins(self):
+        """Write all queued last_login updates in one statement"""
+        with self._pending_lock:
+            user_ids = list(self._pending_logins)
+            self._pending_logins.clear()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        if not user_ids:
+            return
+        try:
+            placeholders = ", ".join(["%s"] * len(user_ids))
+            self.db.execute_query(
+                f"UPDATE users SET last_login = NOW() WHERE id IN ({placeholders})",
+                tuple(user_ids)
+            )
+        except Exception as e:
+            logger.error(f"Error updating last login: {str(e)}")
+        
+    def reset(self):
+        """Clear the auth form fields and hide any error messages"""
+        for field in self._form_fields:
+            field.value = ""
+        for text in self._error_texts:
+            text.visible = False
+        
     def create_login_view(self):
         """Create the login view"""
+        if self._login_layout is not None:
+            self.reset()
+            return self._login_layout
+        
         logger.info("Creating login view")
         try:
             # Form fields
@@ -58,25 +140,47 @@ class AuthView:
                     
                     # Get user from database
                     user = self.db.fetch_one(
-                        "SELECT * FROM users WHERE username = %s",
-                        (username,)
+                        "SELECT id, username, email, role, created_at, last_login, password_hash "
+                        "FROM users WHERE username = %s",
+                        (username,),
+                        prepared=True
+                    )
+                    
+                    # Verify off the event handler and finish once bcrypt is done
+                    hash_to_check = user['password_hash'] if user else self._dummy_hash.result()
+                    future = self._executor.submit(verify_password, password, hash_to_check)
+                    future.add_done_callback(
+                        lambda f: self.page.run_thread(finish_login, f, user, password)
                     )
                     
-                    if not user or not verify_password(password, user['password_hash']):
+                except Exception as e:
+                    logger.error(f"Login error: {str(e)}")
+                    error_text.value = "An error occurred during login"
+                    error_text.visible = True
+                    self.page.update()
+            
+            def finish_login(future, user, password):
+                try:
+                    if not future.result() or not user:
                         error_text.value = "Invalid username or password"
                         error_text.visible = True
                         self.page.update()
                         return
                     
-                    # Set current user
-                    self.current_user = user
-                    logger.info(f"User logged in: {username}")
+                    # Upgrade hashes made with an older bcrypt cost while we have the password
+                    if needs_rehash(user['password_hash']):
+                        self.db.execute_query(
+                            "UPDATE users SET password_hash = %s WHERE id = %s",
+                            (hash_password(password), user['id'])
+                        )
+                        logger.info(f"Rehashed password for user: {user['username']}")
                     
-                    # Update last login
-                    self.db.execute_query(
-                        "UPDATE users SET last_login = NOW() WHERE id = %s",
-                        (user['id'],)
-                    )
+                    # Set current user, keeping the password hash out of the session
+                    self.current_user = {k: v for k, v in user.items() if k != 'password_hash'}
+                    logger.info(f"User logged in: {user['username']}")
+                    
+                    # Update last login in the next batch
+                    self.record_login(user['id'])
                     
                     # Clear form
                     username_field.value = ""
@@ -118,13 +222,7 @@ class AuthView:
                 [
                     # Left side - Logo
                     ft.Container(
-                        content=ft.Image(
-                            src="assets/images/System_Logo.png",
-                            width=400,
-                            height=400,
-                            fit=ft.ImageFit.CONTAIN,
-                            error_content=ft.Text("Logo not found", color=colors.RED)
-                        ),
+                        content=create_logo(),
                         alignment=ft.alignment.center,
                         expand=True,
                         bgcolor=colors.BLUE_50,
@@ -140,6 +238,9 @@ class AuthView:
                 expand=True,
             )
             
+            self._form_fields.extend([username_field, password_field])
+            self._error_texts.append(error_text)
+            self._login_layout = layout
             logger.info("Login view created successfully")
             return layout
             
@@ -149,6 +250,10 @@ class AuthView:
     
     def create_signup_view(self):
         """Create the signup view"""
+        if self._signup_layout is not None:
+            self.reset()
+            return self._signup_layout
+        
         # Form fields
         username_field = ft.TextField(
             label="Username",
@@ -233,10 +338,13 @@ class AuthView:
                     self.page.update()
                     return
                 
-                # Check if username or email already exists
+                # Check if username or email already exists; UNION ALL lets each
+                # branch use its own unique index where OR would not
                 existing_user = self.db.fetch_one(
-                    "SELECT * FROM users WHERE username = %s OR email = %s",
-                    (username, email)
+                    "SELECT 1 FROM users WHERE username = %s "
+                    "UNION ALL SELECT 1 FROM users WHERE email = %s LIMIT 1",
+                    (username, email),
+                    prepared=True
                 )
                 
                 if existing_user:
@@ -245,13 +353,27 @@ class AuthView:
                     self.page.update()
                     return
                 
-                # Hash password
-                password_hash = hash_password(password)
+                # Hash off the event handler and create the user once bcrypt is done
+                future = self._executor.submit(hash_password, password)
+                future.add_done_callback(
+                    lambda f: self.page.run_thread(finish_signup, f, username, email)
+                )
+                
+            except Exception as e:
+                logger.error(f"Signup error: {str(e)}")
+                error_text.value = "An error occurred during signup"
+                error_text.visible = True
+                self.page.update()
+        
+        def finish_signup(future, username, email):
+            try:
+                password_hash = future.result()
                 
                 # Create user
                 self.db.execute_query(
                     "INSERT INTO users (username, email, password_hash, role) VALUES (%s, %s, %s, %s)",
-                    (username, email, password_hash, 'user')
+                    (username, email, password_hash, 'user'),
+                    prepared=True
                 )
                 
                 # Clear form
@@ -298,13 +420,7 @@ class AuthView:
             [
                 # Left side - Logo
                 ft.Container(
-                    content=ft.Image(
-                        src="assets/images/System_Logo.png",
-                        width=400,
-                        height=400,
-                        fit=ft.ImageFit.CONTAIN,
-                        error_content=ft.Text("Logo not found", color=colors.RED)
-                    ),
+                    content=create_logo(),
                     alignment=ft.alignment.center,
                     expand=True,
                     bgcolor=colors.BLUE_50,
@@ -324,4 +440,7 @@ class AuthView:
             expand=True,
         )
         
+        self._form_fields.extend([username_field, email_field, password_field, confirm_password_field])
+        self._error_texts.append(error_text)
+        self._signup_layout = layout
         return layout 
\ No newline at end of file
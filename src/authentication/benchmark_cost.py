@@ -0,0 +1,29 @@
+"""Find the bcrypt cost that keeps hashing near a target duration on this host
+
+Usage: python benchmark_cost.py [target_ms]
+Set the printed value as BCRYPT_COST in the environment.
+"""
+import sys
+import time
+import bcrypt
+
+def time_cost(cost: int, password: bytes = b"benchmark-password") -> float:
+    """Return the seconds taken to hash password with the given cost"""
+    start = time.perf_counter()
+    bcrypt.hashpw(password, bcrypt.gensalt(rounds=cost))
+    return time.perf_counter() - start
+
+def pick_cost(target_ms: float = 250.0, min_cost: int = 10, max_cost: int = 16) -> int:
+    """Return the highest cost whose hash time stays within target_ms"""
+    best = min_cost
+    for cost in range(min_cost, max_cost + 1):
+        elapsed_ms = time_cost(cost) * 1000
+        print(f"cost={cost}: {elapsed_ms:.0f} ms")
+        if elapsed_ms > target_ms:
+            break
+        best = cost
+    return best
+
+if __name__ == "__main__":
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 250.0
+    print(f"BCRYPT_COST={pick_cost(target)}")
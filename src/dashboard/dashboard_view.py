@@ -1,29 +1,60 @@
 import flet as ft
+from concurrent.futures import ThreadPoolExecutor
 from flet_core import colors
 from database.db_connection import DatabaseConnection
-from utils.utils import format_currency, format_percentage
+from utils.utils import format_currency, format_percentage, cached
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds dashboard query results are reused across refreshes
+CACHE_TTL = 30
+
+# Activities fetched per page of the feed
+ACTIVITY_PAGE_SIZE = 10
+
+# Runs the stats and activity queries side by side, each on its own connection
+_executor = ThreadPoolExecutor(max_workers=2)
+
+_ACTIVITY_ICONS = {
+    'worker_added': ft.Icons.PERSON_ADD,
+    'worker_updated': ft.Icons.EDIT,
+    'worker_removed': ft.Icons.DELETE,
+    'performance_updated': ft.Icons.TRENDING_UP,
+    'system': ft.Icons.SETTINGS
+}
+
+_ACTIVITY_COLORS = {
+    'worker_added': colors.GREEN,
+    'worker_updated': colors.BLUE,
+    'worker_removed': colors.RED,
+    'performance_updated': colors.AMBER,
+    'system': colors.GREY
+}
 
 def create_dashboard_view(db: DatabaseConnection, page: ft.Page):
     """Create the dashboard view"""
     
     def refresh_data(e):
         """Refresh dashboard data"""
-        stats_row.controls = [
-            create_stat_card("Total Workers", get_total_workers(), ft.Icons.PEOPLE, colors.BLUE),
-            create_stat_card("Active Workers", get_active_workers(), ft.Icons.PERSON, colors.GREEN),
-            create_stat_card("High Performance", get_high_performance_workers(), ft.Icons.STAR, colors.AMBER)
-        ]
-        activity_list.content = create_activity_list()
+        load_data()
         page.update()
 
-    def create_stat_card(title: str, value: int, icon: str, color: str):
+    def load_data():
+        """Run both dashboard queries concurrently, then fill in the controls"""
+        stats = _executor.submit(get_worker_stats)
+        activities = _executor.submit(get_activity_rows)
+        update_stats(stats.result())
+        update_activity_list(activities.result())
+
+    def create_stat_card(title: str, value_text: ft.Text, icon: str, color: str):
         return ft.Container(
             content=ft.Column([
                 ft.Row([
                     ft.Icon(icon, color=color),
                     ft.Text(title, size=16)
                 ]),
-                ft.Text(str(value), size=24, weight=ft.FontWeight.BOLD)
+                value_text
             ]),
             padding=20,
             border_radius=10,
@@ -31,71 +62,128 @@ def create_dashboard_view(db: DatabaseConnection, page: ft.Page):
             width=200
         )
 
-    def get_total_workers() -> int:
+    def update_stats(stats: dict):
+        """Write the latest counts into the existing stat card texts"""
+        total_text.value = str(stats['total'])
+        active_text.value = str(stats['active'])
+        high_text.value = str(stats['high'])
+
+    def get_worker_stats() -> dict:
+        """Fetch total, active and high performance worker counts in one round-trip"""
         try:
-            result = db.fetch_one("SELECT COUNT(*) as count FROM workers")
-            return result['count'] if result else 0
+            result = cached("worker_stats", CACHE_TTL, lambda: db.fetch_one("""
+                SELECT 
+                    COUNT(*) as total,
+                    SUM(CASE WHEN status = 'active' THEN 1 ELSE 0 END) as active,
+                    SUM(CASE WHEN performance_score >= 8 THEN 1 ELSE 0 END) as high
+                FROM workers
+            """, prepared=True))
+            if not result:
+                return {'total': 0, 'active': 0, 'high': 0}
+            return {
+                'total': int(result['total'] or 0),
+                'active': int(result['active'] or 0),
+                'high': int(result['high'] or 0)
+            }
         except Exception as e:
-            print(f"Error getting total workers: {e}")
-            return 0
+            logger.warning("Error getting worker stats: %s", e)
+            return {'total': 0, 'active': 0, 'high': 0}
 
-    def get_active_workers() -> int:
+    def create_activity_tile():
+        return ft.ListTile(
+            leading=ft.Icon(),
+            title=ft.Text(),
+            subtitle=ft.Text(),
+            trailing=ft.Text()
+        )
+
+    def fetch_activity_rows(before=None):
+        """
+        Stream one page of activities into the (icon, color, title, subtitle, time)
+        tuples shown. Pages are keyed on the last row's (created_at, id) rather than
+        an OFFSET, so a deep page costs the same index seek as the first one.
+        Returns the rows and the key to pass as before for the next page.
+        """
+        where, params = "", ()
+        if before is not None:
+            where = "WHERE a.created_at < %s OR (a.created_at = %s AND a.id < %s)"
+            params = (before[0], before[0], before[1])
+        rows = []
+        last_key = None
+        for activity in db.fetch_iter(f"""
+            SELECT 
+                a.id, a.activity_type, a.description, a.worker_name, a.created_at,
+                DATE_FORMAT(a.created_at, '%Y-%m-%d %H:%i') as ts_fmt
+            FROM activities a
+            {where}
+            ORDER BY a.created_at DESC, a.id DESC
+            LIMIT {ACTIVITY_PAGE_SIZE}
+        """, params, prepared=True):
+            rows.append((
+                get_activity_icon(activity['activity_type']),
+                get_activity_color(activity['activity_type']),
+                activity['description'],
+                f"Worker: {activity['worker_name']}" if activity['worker_name'] else "System",
+                activity['ts_fmt']
+            ))
+            last_key = (activity['created_at'], activity['id'])
+        return rows, last_key
+
+    def get_activity_rows():
+        """The first page of recent activities, or None if it couldn't be loaded"""
         try:
-            result = db.fetch_one("SELECT COUNT(*) as count FROM workers WHERE status = 'active'")
-            return result['count'] if result else 0
+            return cached("recent_activities", CACHE_TTL, fetch_activity_rows)
         except Exception as e:
-            print(f"Error getting active workers: {e}")
-            return 0
+            logger.warning("Error loading activities: %s", e)
+            return None
+
+    def fill_activity_tiles(rows, start=0):
+        """Write rows into the tiles from start on, adding tiles only when there are too few"""
+        while len(activity_rows) < start + len(rows):
+            activity_rows.append(create_activity_tile())
+        for tile, (icon, color, title, subtitle, timestamp) in zip(activity_rows[start:], rows):
+            tile.leading.name = icon
+            tile.leading.color = color
+            tile.title.value = title
+            tile.subtitle.value = subtitle
+            tile.trailing.value = timestamp
+        load_more_button.visible = len(rows) == ACTIVITY_PAGE_SIZE
 
-    def get_high_performance_workers() -> int:
+    def update_activity_list(first_page):
+        """Reset the feed to its first page, reusing the existing tiles"""
+        nonlocal next_activity_key
+        if first_page is None:
+            activity_list.controls = [ft.Text("Error loading activities")]
+            load_more_button.visible = False
+            return
         try:
-            result = db.fetch_one("SELECT COUNT(*) as count FROM workers WHERE performance_score >= 8")
-            return result['count'] if result else 0
+            rows, next_activity_key = first_page
+            del activity_rows[len(rows):]
+            fill_activity_tiles(rows)
+            activity_list.controls = activity_rows
         except Exception as e:
-            print(f"Error getting high performance workers: {e}")
-            return 0
+            logger.warning("Error creating activity list: %s", e)
+            activity_list.controls = [ft.Text("Error loading activities")]
 
-    def create_activity_list():
+    def load_more_activities(e):
+        """Append the next page of activities below the ones already shown"""
+        nonlocal next_activity_key
         try:
-            activities = db.fetch_all("""
-                SELECT a.*, w.name as worker_name 
-                FROM activities a
-                LEFT JOIN workers w ON a.worker_id = w.id
-                ORDER BY a.timestamp DESC
-                LIMIT 10
-            """)
-            
-            return ft.Column([
-                ft.ListTile(
-                    leading=ft.Icon(get_activity_icon(activity['type']), color=get_activity_color(activity['type'])),
-                    title=ft.Text(activity['description']),
-                    subtitle=ft.Text(f"Worker: {activity['worker_name']}" if activity['worker_name'] else "System"),
-                    trailing=ft.Text(activity['timestamp'].strftime("%Y-%m-%d %H:%M"))
-                ) for activity in activities
-            ])
-        except Exception as e:
-            print(f"Error creating activity list: {e}")
-            return ft.Column([ft.Text("Error loading activities")])
+            rows, key = fetch_activity_rows(next_activity_key)
+        except Exception as ex:
+            logger.warning("Error loading more activities: %s", ex)
+            return
+        if key is not None:
+            next_activity_key = key
+        fill_activity_tiles(rows, start=len(activity_rows))
+        activity_list.controls = activity_rows
+        page.update()
 
     def get_activity_icon(activity_type: str) -> str:
-        icons = {
-            'worker_added': ft.Icons.PERSON_ADD,
-            'worker_updated': ft.Icons.EDIT,
-            'worker_removed': ft.Icons.DELETE,
-            'performance_updated': ft.Icons.TRENDING_UP,
-            'system': ft.Icons.SETTINGS
-        }
-        return icons.get(activity_type, ft.Icons.INFO)
+        return _ACTIVITY_ICONS.get(activity_type, ft.Icons.INFO)
 
     def get_activity_color(activity_type: str) -> str:
-        activity_colors = {
-            'worker_added': colors.GREEN,
-            'worker_updated': colors.BLUE,
-            'worker_removed': colors.RED,
-            'performance_updated': colors.AMBER,
-            'system': colors.GREY
-        }
-        return activity_colors.get(activity_type, colors.GREY)
+        return _ACTIVITY_COLORS.get(activity_type, colors.GREY)
 
     # Create header
     header = ft.Row([
@@ -107,18 +195,29 @@ def create_dashboard_view(db: DatabaseConnection, page: ft.Page):
         )
     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
 
-    # Create statistics row
+    # Create statistics row; refreshes only change the value texts
+    total_text = ft.Text("", size=24, weight=ft.FontWeight.BOLD)
+    active_text = ft.Text("", size=24, weight=ft.FontWeight.BOLD)
+    high_text = ft.Text("", size=24, weight=ft.FontWeight.BOLD)
     stats_row = ft.Row([
-        create_stat_card("Total Workers", get_total_workers(), ft.Icons.PEOPLE, colors.BLUE),
-        create_stat_card("Active Workers", get_active_workers(), ft.Icons.PERSON, colors.GREEN),
-        create_stat_card("High Performance", get_high_performance_workers(), ft.Icons.STAR, colors.AMBER)
+        create_stat_card("Total Workers", total_text, ft.Icons.PEOPLE, colors.BLUE),
+        create_stat_card("Active Workers", active_text, ft.Icons.PERSON, colors.GREEN),
+        create_stat_card("High Performance", high_text, ft.Icons.STAR, colors.AMBER)
     ], alignment=ft.MainAxisAlignment.SPACE_AROUND)
 
+    # Activity tiles are reused across refreshes
+    activity_rows = []
+    activity_list = ft.Column()
+    next_activity_key = None
+    load_more_button = ft.TextButton("Load more", on_click=load_more_activities)
+    load_data()
+
     # Create activity section
     activity_section = ft.Container(
         content=ft.Column([
             ft.Text("Recent Activities", size=20, weight=ft.FontWeight.BOLD),
-            create_activity_list()
+            activity_list,
+            load_more_button
         ]),
         padding=20,
         border_radius=10,
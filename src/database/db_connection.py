@@ -1,10 +1,137 @@
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
 from dotenv import load_dotenv
 import os
+import re
+import sys
+import threading
+import weakref
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict, Any
+from collections import Counter
+from typing import Iterator, List, Optional, Dict, Any
 import logging
+from contextlib import contextmanager
+from utils.utils import cached, invalidate
+
+# Connections the pool keeps open; each thread running queries holds one
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+
+# Seconds worker lookups and status counts are served from the cache
+WORKER_CACHE_TTL = 2
+
+# Every table, created statement by statement by create_tables
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS workers (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        role VARCHAR(50) NOT NULL,
+        status ENUM('active', 'inactive', 'on_leave') NOT NULL,
+        performance_score FLOAT DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        tasks_completed INT DEFAULT 0,
+        tasks_to_complete INT DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        worker_id INT,
+        task_description TEXT,
+        is_completed TINYINT(1) DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (worker_id) REFERENCES workers(id) ON DELETE CASCADE
+    );
+    CREATE TABLE IF NOT EXISTS performance_predictions (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        worker_id INT,
+        hours_worked FLOAT,
+        tasks_completed INT,
+        efficiency_rate FLOAT,
+        predicted_score FLOAT,
+        confidence_score FLOAT,
+        features_used JSON,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        created_date DATE AS (DATE(created_at)) STORED,
+        FOREIGN KEY (worker_id) REFERENCES workers(id) ON DELETE CASCADE
+    );
+    CREATE TABLE IF NOT EXISTS activities (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        worker_id INT,
+        activity_type VARCHAR(50) NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        task_id INT,
+        worker_name VARCHAR(100),
+        FOREIGN KEY (worker_id) REFERENCES workers(id) ON DELETE SET NULL,
+        FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE SET NULL
+    );
+    CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        username VARCHAR(50) NOT NULL UNIQUE,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        password_hash VARCHAR(255) NOT NULL,
+        role VARCHAR(20) DEFAULT 'user',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_login TIMESTAMP NULL
+    )
+"""
+
+# Secondary indexes as (table, index name, columns). create_tables adds any
+# that are missing, so databases created before an index existed pick it up.
+INDEXES = [
+    # Covers the status counts and the status + score filters
+    ('workers', 'idx_workers_status_performance', 'status, performance_score'),
+    ('workers', 'idx_workers_performance_score', 'performance_score'),
+    ('workers', 'idx_workers_created_at', 'created_at DESC'),
+    ('activities', 'idx_activities_created_worker', 'created_at DESC, worker_id'),
+    # Keyset pages of the dashboard feed, newest first with ties broken by id
+    ('activities', 'idx_activities_created_id', 'created_at DESC, id DESC'),
+    ('performance_predictions', 'idx_predictions_worker_created', 'worker_id, created_at'),
+    # Analytics filters every worker's predictions by a created_at range
+    ('performance_predictions', 'idx_predictions_created_worker', 'created_at, worker_id'),
+    # Developer list: per-worker task counts, and every pending task newest first
+    ('tasks', 'idx_tasks_worker_completed', 'worker_id, is_completed'),
+    ('tasks', 'idx_tasks_completed_created', 'is_completed, created_at'),
+]
+
+# Foreign keys as (table, column, reference, delete rule). create_tables
+# re-creates any whose rule differs, so older databases pick up the rule.
+# A worker's tasks and predictions go with it; its activities stay, keeping
+# the worker_name they were logged with.
+FOREIGN_KEYS = [
+    ('tasks', 'worker_id', 'workers(id)', 'CASCADE'),
+    ('performance_predictions', 'worker_id', 'workers(id)', 'CASCADE'),
+    ('activities', 'worker_id', 'workers(id)', 'SET NULL'),
+    ('activities', 'task_id', 'tasks(id)', 'SET NULL'),
+]
+
+# Columns added after a table was first shipped, as (table, column, definition,
+# backfill). create_tables adds any that are missing and runs the backfill once.
+COLUMNS = [
+    # Worker name at the time of the activity, so the feed needs no join
+    ('activities', 'worker_name', 'VARCHAR(100)',
+     "UPDATE activities a JOIN workers w ON a.worker_id = w.id SET a.worker_name = w.name"),
+    ('workers', 'updated_at',
+     'TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP', None),
+    # Day bucket analytics groups by, computed once on write instead of per query
+    ('performance_predictions', 'created_date', 'DATE AS (DATE(created_at)) STORED', None),
+    # Inputs the predictor scored, as JSON any client can parse
+    ('performance_predictions', 'features_used', 'JSON', None),
+]
+
+# Leading verb, an optional COUNT(*) right after SELECT, and the first table
+# a mock query names -- the key MockCursor dispatches on
+_MOCK_QUERY_RE = re.compile(
+    r'\s*(select|insert)\b(\s+count\(\*\))?.*?\b(workers|activities|performance_predictions)\b',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Query text -> (handler, table) for queries MockCursor has already parsed
+_mock_routes = {}
+MOCK_ROUTE_CACHE_SIZE = 256
+
+def _mock_now():
+    """The current time, formatted like the mock dataset's created_at values"""
+    return datetime.now().isoformat(' ', 'seconds')
 
 class MockConnection:
     """Mock database connection for development"""
@@ -14,16 +141,16 @@ class MockConnection:
                 {
                     'id': 1,
                     'name': 'John Doe',
-                    'role': 'Developer',
-                    'status': 'active',
+                    'role': sys.intern('Developer'),
+                    'status': sys.intern('active'),
                     'performance_score': 8.5,
                     'created_at': '2025-06-09 10:00:00'
                 },
                 {
                     'id': 2,
                     'name': 'Jane Smith',
-                    'role': 'Designer',
-                    'status': 'active',
+                    'role': sys.intern('Designer'),
+                    'status': sys.intern('active'),
                     'performance_score': 9.0,
                     'created_at': '2025-06-09 11:00:00'
                 }
@@ -34,6 +161,7 @@ class MockConnection:
                     'worker_id': 1,
                     'activity_type': 'task_completion',
                     'description': 'Completed project milestone',
+                    'worker_name': 'John Doe',
                     'created_at': '2025-06-09 10:30:00'
                 },
                 {
@@ -41,6 +169,7 @@ class MockConnection:
                     'worker_id': 2,
                     'activity_type': 'bug_fix',
                     'description': 'Fixed critical bug',
+                    'worker_name': 'Jane Smith',
                     'created_at': '2025-06-09 11:30:00'
                 }
             ],
@@ -87,6 +216,17 @@ class MockConnection:
                 }
             ]
         }
+        # Workers by id, kept in step with inserts so joins are a dict lookup
+        self.mock_data['_worker_by_id'] = {w['id']: w for w in self.mock_data['workers']}
+        # Next AUTO_INCREMENT value per table; ids are never reused
+        self.mock_data['_next_id'] = {
+            table: max((row['id'] for row in self.mock_data[table]), default=0) + 1
+            for table in ('workers', 'activities', 'performance_predictions')
+        }
+        # Worker counts the dashboard asks for, kept up to date by inserts
+        workers = self.mock_data['workers']
+        self.mock_data['_status_counts'] = Counter(w['status'] for w in workers)
+        self.mock_data['_high_performance'] = sum(1 for w in workers if w['performance_score'] >= 8.0)
 
     def cursor(self, dictionary=False):
         return MockCursor(self.mock_data, dictionary)
@@ -102,81 +242,139 @@ class MockCursor:
         self.last_query = None
         self.last_params = None
         self.results = []
+        self.lastrowid = None
+        self.rowcount = -1
 
     def execute(self, query, params=None):
         self.last_query = query
         self.last_params = params
         
-        # Simple query parsing
+        # The app sends the same few query strings over and over, so each
+        # one is parsed once and its handler looked up by text afterwards
+        route = _mock_routes.get(query)
+        if route is None:
+            route = self._route(query)
+            if len(_mock_routes) < MOCK_ROUTE_CACHE_SIZE:
+                _mock_routes[query] = route
+        handler, table = route
+        if handler:
+            handler(self, table, query, params)
+
+    def _route(self, query):
+        """Find the (handler, table) for a query; statements the mock ignores get no handler"""
+        # One match pulls out everything the dispatch needs; other statements
+        # (UPDATE, DELETE, transactions) are no-ops in the mock
+        match = _MOCK_QUERY_RE.match(query)
+        if not match:
+            return None, None
+        verb, count, table = match.groups()
+        table = table.lower()
+        return self._DISPATCH.get((verb.lower(), bool(count), table)), table
+
+    def _count_workers(self, table, query, params):
         query = query.lower()
-        if 'select' in query:
-            if 'count(*)' in query:
-                if 'workers' in query:
-                    if 'status =' in query and "'active'" in query:
-                        self.results = [{'count': len([w for w in self.mock_data['workers'] if w['status'] == 'active'])}]
-                    elif 'performance_score >=' in query:
-                        self.results = [{'count': len([w for w in self.mock_data['workers'] if w['performance_score'] >= 8.0])}]
-                    else:
-                        self.results = [{'count': len(self.mock_data['workers'])}]
-                elif 'activities' in query:
-                    self.results = [{'count': len(self.mock_data['activities'])}]
-                elif 'performance_predictions' in query:
-                    self.results = [{'count': len(self.mock_data['performance_predictions'])}]
-            elif 'performance_predictions' in query:
-                # Handle JOIN query for performance predictions
-                joined_results = []
-                for pred in self.mock_data['performance_predictions']:
-                    worker = next((w for w in self.mock_data['workers'] if w['id'] == pred['worker_id']), None)
-                    if worker:
-                        joined_results.append({
-                            'id': pred['id'],
-                            'worker_id': pred['worker_id'],
-                            'worker_name': worker['name'],
-                            'hours_worked': pred['hours_worked'],
-                            'tasks_completed': pred['tasks_completed'],
-                            'efficiency_rate': pred['efficiency_rate'],
-                            'predicted_score': pred['predicted_score'],
-                            'confidence_score': pred['confidence_score'],
-                            'created_at': pred['created_at']
-                        })
-                self.results = joined_results
-            elif 'workers' in query:
-                self.results = self.mock_data['workers']
-            elif 'activities' in query:
-                self.results = self.mock_data['activities']
-        elif 'insert' in query:
-            if 'workers' in query:
-                new_id = len(self.mock_data['workers']) + 1
-                self.mock_data['workers'].append({
-                    'id': new_id,
-                    'name': params[0],
-                    'role': params[1],
-                    'status': params[2],
-                    'performance_score': params[3] if len(params) > 3 else 0.0,
-                    'created_at': '2025-06-09 12:00:00'
-                })
-            elif 'activities' in query:
-                new_id = len(self.mock_data['activities']) + 1
-                self.mock_data['activities'].append({
-                    'id': new_id,
-                    'worker_id': params[0],
-                    'activity_type': params[1],
-                    'description': params[2],
-                    'created_at': '2025-06-09 12:00:00'
-                })
-            elif 'performance_predictions' in query:
-                new_id = len(self.mock_data['performance_predictions']) + 1
-                worker = next((w for w in self.mock_data['workers'] if w['id'] == params[0]), None)
-                self.mock_data['performance_predictions'].append({
-                    'id': new_id,
-                    'worker_id': params[0],
-                    'hours_worked': params[1],
-                    'tasks_completed': params[2],
-                    'efficiency_rate': params[3],
-                    'predicted_score': params[4],
-                    'confidence_score': params[5],
-                    'created_at': '2025-06-09 12:00:00'
+        if 'status =' in query and "'active'" in query:
+            self.results = [{'count': self.mock_data['_status_counts']['active']}]
+        elif 'performance_score >=' in query:
+            self.results = [{'count': self.mock_data['_high_performance']}]
+        else:
+            self.results = [{'count': len(self.mock_data['workers'])}]
+
+    def _count_rows(self, table, query, params):
+        self.results = [{'count': len(self.mock_data[table])}]
+
+    def _select_rows(self, table, query, params):
+        self.results = self.mock_data[table]
+
+    def _select_predictions(self, table, query, params):
+        # Handle JOIN query for performance predictions
+        joined_results = []
+        worker_by_id = self.mock_data['_worker_by_id']
+        for pred in self.mock_data['performance_predictions']:
+            worker = worker_by_id.get(pred['worker_id'])
+            if worker:
+                joined_results.append({
+                    'id': pred['id'],
+                    'worker_id': pred['worker_id'],
+                    'worker_name': worker['name'],
+                    'hours_worked': pred['hours_worked'],
+                    'tasks_completed': pred['tasks_completed'],
+                    'efficiency_rate': pred['efficiency_rate'],
+                    'predicted_score': pred['predicted_score'],
+                    'confidence_score': pred['confidence_score'],
+                    'created_at': pred['created_at']
                 })
+        self.results = joined_results
+
+    def _next_id(self, table):
+        """Take the next id for table, like AUTO_INCREMENT"""
+        next_id = self.mock_data['_next_id']
+        new_id = next_id[table]
+        next_id[table] = new_id + 1
+        return new_id
+
+    def _insert_worker(self, table, query, params):
+        new_id = self._next_id(table)
+        worker = {
+            'id': new_id,
+            'name': params[0],
+            # Few distinct values repeated across rows; share one string each
+            'role': sys.intern(params[1]),
+            'status': sys.intern(params[2]),
+            'performance_score': params[3] if len(params) > 3 else 0.0,
+            'created_at': _mock_now()
+        }
+        self.mock_data['workers'].append(worker)
+        self.mock_data['_worker_by_id'][new_id] = worker
+        self.mock_data['_status_counts'][worker['status']] += 1
+        if worker['performance_score'] >= 8.0:
+            self.mock_data['_high_performance'] += 1
+        self.lastrowid = new_id
+
+    def _insert_activity(self, table, query, params):
+        new_id = self._next_id(table)
+        self.mock_data['activities'].append({
+            'id': new_id,
+            'worker_id': params[0],
+            'activity_type': params[1],
+            'description': params[2],
+            'worker_name': params[3] if len(params) > 3 else None,
+            'created_at': _mock_now()
+        })
+        self.lastrowid = new_id
+
+    def _insert_prediction(self, table, query, params):
+        new_id = self._next_id(table)
+        self.mock_data['performance_predictions'].append({
+            'id': new_id,
+            'worker_id': params[0],
+            'hours_worked': params[1],
+            'tasks_completed': params[2],
+            'efficiency_rate': params[3],
+            'predicted_score': params[4],
+            'confidence_score': params[5],
+            'created_at': _mock_now()
+        })
+        self.lastrowid = new_id
+
+    # (verb, is COUNT(*), table) -> handler
+    _DISPATCH = {
+        ('select', True, 'workers'): _count_workers,
+        ('select', True, 'activities'): _count_rows,
+        ('select', True, 'performance_predictions'): _count_rows,
+        ('select', False, 'workers'): _select_rows,
+        ('select', False, 'activities'): _select_rows,
+        ('select', False, 'performance_predictions'): _select_predictions,
+        ('insert', False, 'workers'): _insert_worker,
+        ('insert', False, 'activities'): _insert_activity,
+        ('insert', False, 'performance_predictions'): _insert_prediction,
+    }
+
+    def executemany(self, query, params_seq):
+        self.rowcount = 0
+        for params in params_seq:
+            self.execute(query, params)
+            self.rowcount += 1
 
     def fetchone(self):
         return self.results[0] if self.results else None
@@ -189,215 +387,431 @@ class MockCursor:
 
 class DatabaseConnection:
     def __init__(self):
-        self.connection = None
+        self._config = {
+            'host': "localhost",
+            'user': "root",
+            'password': "H4ckm3!_",
+            'database': "worker_tracker",
+            # Threads keep their connection for life; without autocommit a
+            # thread that only reads would stay on its first snapshot and
+            # never see rows other threads commit
+            'autocommit': True
+        }
+        # Each thread gets its own connection, reusable cursor and prepared
+        # statement cache, so views can run queries concurrently without
+        # sharing a socket. Connections are borrowed from the pool and handed
+        # back when their thread exits or close() is called.
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._pool = None
         try:
-            self.connection = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="H4ckm3!_",
-                database="worker_tracker"
+            # Pooled connections inherit autocommit from self._config: each
+            # statement commits on its own, and transaction() is the only
+            # place a multi-statement transaction is opened
+            self._pool = pooling.MySQLConnectionPool(
+                pool_name="crewpilot", pool_size=POOL_SIZE, **self._config
             )
             if self.connection.is_connected():
                 logging.info("Successfully connected to MySQL database")
                 self.create_tables()
         except Error as e:
-            logging.error(f"Error connecting to MySQL database: {str(e)}")
+            logging.error("Error connecting to MySQL database: %s", e)
             logging.info("Using mock database connection for development")
             self.use_mock = True
         else:
             self.use_mock = False
 
+    @property
+    def connection(self):
+        """The calling thread's connection, opened on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._borrow_connection()
+            self._local.connection = connection
+            # Buffered so each statement's rows are read in full and the
+            # cursor can run the next one straight away
+            self._local.cursor = connection.cursor(dictionary=True, buffered=True)
+            self._local.stmt_cache = {}
+            entry = (connection, self._local.cursor, self._local.stmt_cache)
+            with self._connections_lock:
+                self._connections.append(entry)
+            # Give the connection back once the thread that owns it is gone
+            weakref.finalize(threading.current_thread(), self._return_connection, entry)
+        return connection
+
+    def _borrow_connection(self):
+        """Take a connection from the pool, or open an extra one if it's exhausted"""
+        try:
+            return self._pool.get_connection()
+        except pooling.PoolError as e:
+            logging.warning("Connection pool exhausted, opening a direct connection: %s", e)
+            return mysql.connector.connect(**self._config)
+
+    def _return_connection(self, entry):
+        """Close a thread's cursors and give its connection back, unless close() already did"""
+        with self._connections_lock:
+            if entry not in self._connections:
+                return
+            self._connections.remove(entry)
+        self._close_entry(entry)
+
+    @staticmethod
+    def _close_entry(entry):
+        """Close a connection's cursors, then the connection (returning it to its pool)"""
+        connection, shared_cursor, stmt_cache = entry
+        shared_cursor.close()
+        for cursor in stmt_cache.values():
+            cursor.close()
+        stmt_cache.clear()
+        if connection.is_connected():
+            connection.close()
+
+    @property
+    def _shared_cursor(self):
+        """The calling thread's reusable dictionary cursor"""
+        self.connection  # Opens the connection and its cursor on first use
+        return self._local.cursor
+
+    @property
+    def _stmt_cache(self):
+        """Server-side prepared cursors for the calling thread, keyed by SQL text"""
+        return self._local.stmt_cache
+
     def create_tables(self):
         """Create necessary tables if they don't exist"""
+        cursor = None
         try:
             cursor = self.connection.cursor()
             
-            # Create workers table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS workers (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(100) NOT NULL,
-                    role VARCHAR(50) NOT NULL,
-                    status VARCHAR(20) NOT NULL,
-                    performance_score FLOAT DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    tasks_completed INT DEFAULT 0,
-                    tasks_to_complete INT DEFAULT 0
-                )
-            """)
+            # One statement per execute: this runs once at startup, and
+            # doesn't depend on the connector accepting multi=True
+            for statement in SCHEMA.split(';'):
+                if statement.strip():
+                    cursor.execute(statement)
             
-            # Create tasks table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    worker_id INT,
-                    task_description TEXT,
-                    is_completed TINYINT(1) DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (worker_id) REFERENCES workers(id)
-                )
-            """)
+            self.create_columns(cursor)
+            self.create_indexes(cursor)
+            self.create_foreign_keys(cursor)
             
-            # Create performance_predictions table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS performance_predictions (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    worker_id INT,
-                    hours_worked FLOAT,
-                    tasks_completed INT,
-                    efficiency_rate FLOAT,
-                    predicted_score FLOAT,
-                    confidence_score FLOAT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (worker_id) REFERENCES workers(id)
-                )
-            """)
-            
-            # Create activities table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS activities (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    worker_id INT,
-                    activity_type VARCHAR(50) NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    task_id INT,
-                    FOREIGN KEY (worker_id) REFERENCES workers(id),
-                    FOREIGN KEY (task_id) REFERENCES tasks(id)
-                )
-            """)
-            
-            # Create users table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    username VARCHAR(50) NOT NULL UNIQUE,
-                    email VARCHAR(100) NOT NULL UNIQUE,
-                    password_hash VARCHAR(255) NOT NULL,
-                    role VARCHAR(20) DEFAULT 'user',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_login TIMESTAMP NULL
-                )
-            """)
-            
-            self.connection.commit()
             logging.info("Database tables created successfully")
             
         except Error as e:
-            logging.error(f"Error creating tables: {str(e)}")
+            logging.exception("Error creating tables: %s", e)
             raise e
         finally:
             if cursor:
                 cursor.close()
 
-    def execute_query(self, query, params=None):
-        """Execute a query and return the result"""
+    def create_columns(self, cursor):
+        """Add the columns listed in COLUMNS that don't exist yet and backfill them"""
+        cursor.execute("""
+            SELECT TABLE_NAME, COLUMN_NAME
+            FROM information_schema.columns
+            WHERE TABLE_SCHEMA = DATABASE()
+        """)
+        existing = set(cursor.fetchall())
+        for table, column, definition, backfill in COLUMNS:
+            if (table, column) not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                if backfill:
+                    cursor.execute(backfill)
+                logging.info("Added column %s to %s", column, table)
+
+    def create_foreign_keys(self, cursor):
+        """Re-create the foreign keys listed in FOREIGN_KEYS whose delete rule differs"""
+        cursor.execute("""
+            SELECT k.TABLE_NAME, k.COLUMN_NAME, k.CONSTRAINT_NAME, r.DELETE_RULE
+            FROM information_schema.key_column_usage k
+            JOIN information_schema.referential_constraints r
+              ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA
+             AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+            WHERE k.TABLE_SCHEMA = DATABASE()
+        """)
+        existing = {(table, column): (name, rule) for table, column, name, rule in cursor.fetchall()}
+        for table, column, reference, rule in FOREIGN_KEYS:
+            name, current = existing.get((table, column), (None, None))
+            if current == rule:
+                continue
+            if name:
+                cursor.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {name}")
+            cursor.execute(
+                f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) "
+                f"REFERENCES {reference} ON DELETE {rule}"
+            )
+            logging.info("Set ON DELETE %s on %s.%s", rule, table, column)
+
+    def create_indexes(self, cursor):
+        """Create the secondary indexes listed in INDEXES that don't exist yet"""
+        cursor.execute("""
+            SELECT DISTINCT TABLE_NAME, INDEX_NAME
+            FROM information_schema.statistics
+            WHERE TABLE_SCHEMA = DATABASE()
+        """)
+        existing = set(cursor.fetchall())
+        for table, name, columns in INDEXES:
+            if (table, name) not in existing:
+                cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+                logging.info("Created index %s on %s", name, table)
+
+    def _prepared_cursor(self, query):
+        """Return the prepared cursor for query, preparing it on first use"""
+        connection = self.connection
+        cursor = self._stmt_cache.get(query)
+        if cursor is None:
+            cursor = connection.cursor(prepared=True, dictionary=True)
+            self._stmt_cache[query] = cursor
+        return cursor
+
+    def _cursor(self, query, prepared):
+        """Get a cursor for query: a cached prepared one, or the thread's shared one"""
+        if prepared:
+            return self._prepared_cursor(query)
+        return self._shared_cursor
+
+    def _release(self, query, cursor, prepared, failed=False):
+        """Close a one-off cursor; evict a prepared one whose statement failed"""
+        if not cursor or cursor is getattr(self._local, 'cursor', None):
+            return
+        if not prepared:
+            cursor.close()
+        elif failed:
+            self._stmt_cache.pop(query, None)
+            cursor.close()
+
+    def execute_query(self, query, params=None, prepared=False):
+        """
+        Execute a query and return the cursor it ran on. The cursor is reused by
+        the thread's next query, so read lastrowid/rowcount before issuing one.
+        """
+        cursor = None
+        failed = False
         try:
-            cursor = self.connection.cursor(dictionary=True)
+            cursor = self._cursor(query, prepared)
             cursor.execute(query, params or ())
-            self.connection.commit()
             return cursor
         except Error as e:
-            logging.error(f"Error executing query: {str(e)}")
+            failed = True
+            logging.exception("Error executing query: %s", e)
             raise e
         finally:
-            if cursor:
-                cursor.close()
+            self._release(query, cursor, prepared, failed)
 
-    def fetch_one(self, query, params=None):
+    def execute_many(self, query, params_seq):
+        """
+        Execute a query once per parameter tuple in a single call; the driver
+        folds INSERT ... VALUES into one multi-row statement. Returns the cursor.
+        """
+        try:
+            cursor = self._shared_cursor
+            cursor.executemany(query, params_seq)
+            return cursor
+        except Error as e:
+            logging.exception("Error executing batch: %s", e)
+            raise e
+
+    def end_snapshot(self):
+        """
+        Close any transaction left open on the calling thread's connection, so
+        its next read sees the latest committed data. Connections autocommit,
+        so this only matters if a read ran with autocommit switched off.
+        Don't call it inside a transaction() block.
+        """
+        connection = self.connection
+        if connection.in_transaction:
+            connection.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the block as one transaction on the calling thread's pooled
+        connection, yielding its cursor. Commits when the block finishes and
+        rolls back if it raises. Outside of it connections autocommit, so
+        this is the way to group several statements atomically.
+        """
+        connection = self.connection
+        # start_transaction refuses to run while an implicit transaction
+        # from an earlier read is still open
+        self.end_snapshot()
+        connection.start_transaction()
+        try:
+            yield self._shared_cursor
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+    def execute_batch(self, statements):
+        """
+        Run a list of (query, params) pairs as one transaction on the thread's
+        cursor, committing once at the end. Rolls back and re-raises if any of
+        them fails.
+        """
+        try:
+            with self.transaction() as cursor:
+                # One execute per statement: multi=True isn't available in
+                # every connector release requirements.txt allows
+                for query, params in statements:
+                    cursor.execute(query, params or ())
+        except Error as e:
+            logging.exception("Error executing batch: %s", e)
+            raise e
+
+    def fetch_one(self, query, params=None, prepared=False):
         """Fetch a single row from the database"""
+        cursor = None
+        failed = False
         try:
-            cursor = self.connection.cursor(dictionary=True)
+            cursor = self._cursor(query, prepared)
             cursor.execute(query, params or ())
+            if prepared:
+                # Drain the result so the cached statement can be re-executed
+                rows = cursor.fetchall()
+                return rows[0] if rows else None
             return cursor.fetchone()
         except Error as e:
-            logging.error(f"Error fetching one: {str(e)}")
+            failed = True
+            logging.exception("Error fetching one: %s", e)
             raise e
         finally:
-            if cursor:
-                cursor.close()
+            self._release(query, cursor, prepared, failed)
 
-    def fetch_all(self, query, params=None):
+    def fetch_all(self, query, params=None, prepared=False):
         """Fetch all rows from the database"""
+        cursor = None
+        failed = False
+        try:
+            cursor = self._cursor(query, prepared)
+            cursor.execute(query, params or ())
+            return cursor.fetchall()
+        except Error as e:
+            failed = True
+            logging.exception("Error fetching all: %s", e)
+            raise e
+        finally:
+            self._release(query, cursor, prepared, failed)
+
+    def fetch_all_in(self, query, ids, params=(), prepared=False):
+        """
+        Fetch all rows of a query filtering on a list of values. The query marks
+        the list with {ids}, which becomes one placeholder per value; params
+        fill any placeholders after it. Returns no rows for an empty list.
+        """
+        ids = list(ids)
+        if not ids:
+            return []
+        query = query.format(ids=",".join(["%s"] * len(ids)))
+        return self.fetch_all(query, (*ids, *params), prepared)
+
+    def fetch_tuples(self, query, params=None):
+        """Fetch all rows as plain tuples in column order, for callers that unpack them"""
+        cursor = None
         try:
-            cursor = self.connection.cursor(dictionary=True)
+            cursor = self.connection.cursor()
             cursor.execute(query, params or ())
             return cursor.fetchall()
         except Error as e:
-            logging.error(f"Error fetching all: {str(e)}")
+            logging.exception("Error fetching rows: %s", e)
             raise e
         finally:
             if cursor:
                 cursor.close()
 
+    def fetch_iter(self, query, params=None, prepared=False, size=64):
+        """
+        Yield rows one at a time, pulling them from the server in batches of size.
+        Consume the iterator fully before issuing the next query.
+        """
+        cursor = None
+        failed = False
+        try:
+            # A one-off unbuffered cursor, so rows stream instead of being
+            # read in full like on the shared cursor
+            if prepared:
+                cursor = self._prepared_cursor(query)
+            else:
+                cursor = self.connection.cursor(dictionary=True)
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                yield from rows
+        except Error as e:
+            failed = True
+            logging.exception("Error fetching rows: %s", e)
+            raise e
+        finally:
+            self._release(query, cursor, prepared, failed)
+
     def close(self):
-        """Close the database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
+        """Close every thread's cursors and return its connection to the pool"""
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = []
+        for entry in connections:
+            self._close_entry(entry)
+        self._local = threading.local()
+        if connections:
             logging.info("Database connection closed")
 
     # Worker Management Methods
     def get_all_workers(self) -> List[Dict[str, Any]]:
         """Get all workers with their details"""
+        return list(self.iter_all_workers())
+
+    def iter_all_workers(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield all workers one at a time, streamed from the server, for callers
+        that only loop over them. Consume it fully before the next query.
+        """
+        # Rows come back as the dicts callers want, with the score already a float
         query = """
-            SELECT id, name, role, status, performance_score, created_at
+            SELECT id, name, role, status,
+                CAST(performance_score AS DOUBLE) as performance_score, created_at
             FROM workers
             ORDER BY created_at DESC
         """
-        workers = self.fetch_all(query)
-        return [
-            {
-                'id': worker['id'],
-                'name': worker['name'],
-                'role': worker['role'],
-                'status': worker['status'],
-                'performance_score': float(worker['performance_score']),
-                'created_at': worker['created_at']
-            }
-            for worker in workers
-        ]
+        return self.fetch_iter(query)
         
     def get_worker_by_id(self, worker_id: int) -> Optional[Dict[str, Any]]:
         """Get a worker by their ID"""
+        return cached(f"worker:{worker_id}", WORKER_CACHE_TTL,
+                      lambda: self._fetch_worker(worker_id))
+
+    def _fetch_worker(self, worker_id: int) -> Optional[Dict[str, Any]]:
+        """Read a worker from the database, bypassing the cache"""
         query = """
-            SELECT id, name, role, status, performance_score, created_at
+            SELECT id, name, role, status,
+                CAST(performance_score AS DOUBLE) as performance_score, created_at
             FROM workers
             WHERE id = %s
         """
-        worker = self.fetch_one(query, (worker_id,))
-        if worker:
-            return {
-                'id': worker['id'],
-                'name': worker['name'],
-                'role': worker['role'],
-                'status': worker['status'],
-                'performance_score': float(worker['performance_score']),
-                'created_at': worker['created_at']
-            }
-        return None
+        return self.fetch_one(query, (worker_id,))
         
     def add_worker(self, worker_data: Dict[str, Any]) -> Optional[int]:
         """Add a new worker"""
         query = """
-            INSERT INTO workers (name, role, status, performance_score, created_at)
-            VALUES (%s, %s, %s, %s, %s)
+            INSERT INTO workers (name, role, status, performance_score)
+            VALUES (%s, %s, %s, %s)
         """
         params = (
             worker_data['name'],
             worker_data['role'],
             worker_data['status'],
-            worker_data['performance_score'],
-            datetime.now()
+            worker_data['performance_score']
         )
         
-        self.execute_query(query, params)
-        return self.fetch_one("SELECT LAST_INSERT_ID()")['LAST_INSERT_ID()']
-        
+        worker_id = self.execute_query(query, params, prepared=True).lastrowid
+        invalidate("worker_status_counts", "worker_stats")
+        return worker_id
+
     def update_worker(self, worker_id: int, worker_data: Dict[str, Any]) -> bool:
         """Update an existing worker"""
         query = """
             UPDATE workers 
-            SET name = %s, role = %s, status = %s, performance_score = %s, updated_at = %s
+            SET name = %s, role = %s, status = %s, performance_score = %s,
+                updated_at = CURRENT_TIMESTAMP
             WHERE id = %s
         """
         params = (
@@ -405,69 +819,62 @@ class DatabaseConnection:
             worker_data['role'],
             worker_data['status'],
             worker_data['performance_score'],
-            datetime.now(),
             worker_id
         )
         
-        self.execute_query(query, params)
-        return self.fetch_one("SELECT ROW_COUNT()")['ROW_COUNT()'] > 0
+        updated = self.execute_query(query, params, prepared=True).rowcount > 0
+        invalidate(f"worker:{worker_id}", "worker_status_counts", "worker_stats")
+        return updated
         
     def delete_worker(self, worker_id: int) -> bool:
         """Delete a worker"""
         query = "DELETE FROM workers WHERE id = %s"
-        self.execute_query(query, (worker_id,))
-        return self.fetch_one("SELECT ROW_COUNT()")['ROW_COUNT()'] > 0
+        deleted = self.execute_query(query, (worker_id,), prepared=True).rowcount > 0
+        invalidate(f"worker:{worker_id}", "worker_status_counts", "worker_stats")
+        return deleted
         
     def get_worker_stats(self) -> Dict[str, int]:
         """Get worker statistics"""
-        stats = {
-            'total': 0,
-            'active': 0,
-            'inactive': 0,
-            'on_leave': 0
-        }
-        
-        # Get total workers
-        total = self.fetch_one("SELECT COUNT(*) FROM workers")
-        if total:
-            stats['total'] = total[0]
-            
-        # Get workers by status
-        status_counts = self.fetch_all("""
-            SELECT status, COUNT(*) 
-            FROM workers 
-            GROUP BY status
+        return cached("worker_status_counts", WORKER_CACHE_TTL, self._fetch_worker_stats)
+
+    def _fetch_worker_stats(self) -> Dict[str, int]:
+        """Count workers by status in the database, bypassing the cache"""
+        row = self.fetch_one("""
+            SELECT 
+                COUNT(*) as total,
+                SUM(status = 'active') as active,
+                SUM(status = 'inactive') as inactive,
+                SUM(status = 'on_leave') as on_leave
+            FROM workers
         """)
-        for status, count in status_counts:
-            stats[status] = count
-            
-        return stats
+        if not row:
+            return {'total': 0, 'active': 0, 'inactive': 0, 'on_leave': 0}
+        return {
+            'total': int(row['total'] or 0),
+            'active': int(row['active'] or 0),
+            'inactive': int(row['inactive'] or 0),
+            'on_leave': int(row['on_leave'] or 0)
+        }
         
     def log_activity(self, description: str, activity_type: str) -> bool:
         """Log an activity"""
         query = """
-            INSERT INTO activities (worker_id, activity_type, description, created_at)
+            INSERT INTO activities (worker_id, activity_type, description, worker_name)
             VALUES (%s, %s, %s, %s)
         """
-        self.execute_query(query, (None, activity_type, description, datetime.now()))
-        return self.fetch_one("SELECT LAST_INSERT_ID()")['LAST_INSERT_ID()'] is not None
-        
+        cursor = self.execute_query(
+            query, (None, activity_type, description, None), prepared=True
+        )
+        invalidate("recent_activities")
+        return cursor.lastrowid is not None
+
     def get_recent_activities(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent activities"""
         query = """
-            SELECT id, worker_id, activity_type, description, created_at
+            SELECT id, worker_id, activity_type, description, worker_name, created_at
             FROM activities
             ORDER BY created_at DESC
             LIMIT %s
         """
-        activities = self.fetch_all(query, (limit,))
-        return [
-            {
-                'id': activity['id'],
-                'worker_id': activity['worker_id'],
-                'activity_type': activity['activity_type'],
-                'description': activity['description'],
-                'created_at': activity['created_at']
-            }
-            for activity in activities
-        ] 
\ No newline at end of file
+        return self.fetch_all(query, (limit,)) 
+
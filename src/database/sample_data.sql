@@ -40,6 +40,9 @@ INSERT INTO activities (worker_id, activity_type, description, created_at) VALUE
     (10, 'launch', 'Launched new product feature', DATE_SUB(NOW(), INTERVAL 1 DAY)),
     (10, 'feedback', 'Gathered user feedback', DATE_SUB(NOW(), INTERVAL 3 DAY));
 
+-- Copy worker names onto the sample activities
+UPDATE activities a JOIN workers w ON a.worker_id = w.id SET a.worker_name = w.name;
+
 -- Insert sample performance predictions
 INSERT INTO performance_predictions (worker_id, hours_worked, tasks_completed, efficiency_rate, predicted_score, confidence_score, created_at) VALUES
     (1, 160, 12, 0.92, 9.2, 0.85, DATE_SUB(NOW(), INTERVAL 1 DAY)),
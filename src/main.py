@@ -7,36 +7,100 @@ from flet import (
 )
 from flet_core import colors
 from database.db_connection import DatabaseConnection
-from utils.utils import setup_logging, log_error, format_percentage
+from utils.utils import setup_logging, log_error, format_percentage, cached, invalidate
 import logging
+import numpy as np
+import re
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
 from authentication.auth_view import AuthView
-from chatbot.chatbot_view import get_chatbot_view
 
-def get_activity_icon(activity_type: str) -> str:
-    """Get the appropriate icon for an activity type"""
-    icons = {
-        'task_completed': ft.Icons.CHECK_CIRCLE,
-        'task_assigned': ft.Icons.ASSIGNMENT,
-        'performance_review': ft.Icons.STAR,
-        'training': ft.Icons.SCHOOL,
-        'incident': ft.Icons.WARNING,
-        'leave': ft.Icons.EVENT_BUSY,
-        'return': ft.Icons.EVENT_AVAILABLE
-    }
-    return icons.get(activity_type.lower(), ft.Icons.INFO)
+# Analytics queries, one per shape so each is prepared once per connection.
+# {column} is filled from the fixed metric mapping; all user input goes
+# through %s placeholders.
+ANALYTICS_QUERY = """
+    SELECT 
+        pp.created_date as date,
+        AVG({column}) as value,
+        AVG(pp.confidence_score) as confidence,
+        COUNT(DISTINCT t.id) as total_tasks,
+        SUM(CASE WHEN t.is_completed = 1 THEN 1 ELSE 0 END) as completed_tasks
+    FROM workers w
+    LEFT JOIN performance_predictions pp ON w.id = pp.worker_id
+    LEFT JOIN tasks t ON w.id = t.worker_id
+    WHERE pp.created_at BETWEEN %s AND %s{worker_filter}
+    GROUP BY pp.created_date
+    ORDER BY date
+"""
+QUERY_ALL = ANALYTICS_QUERY.replace("{worker_filter}", "")
+QUERY_WORKER = ANALYTICS_QUERY.replace("{worker_filter}", " AND w.id = %s")
 
-def get_activity_color(activity_type: str) -> str:
-    """Get the appropriate color for an activity type"""
-    color_map = {
-        'task_completed': colors.GREEN,
-        'task_assigned': colors.BLUE,
-        'performance_review': colors.AMBER,
-        'training': colors.PURPLE,
-        'incident': colors.RED,
-        'leave': colors.ORANGE,
-        'return': colors.TEAL
-    }
-    return color_map.get(activity_type.lower(), colors.GREY)
+# Analytics metric -> database column. Only these columns are ever
+# formatted into the SQL.
+_METRIC_COLUMNS = {
+    "performance": "w.performance_score",
+    "efficiency": "pp.efficiency_rate",
+    "tasks": "w.tasks_completed",
+    "hours": "pp.hours_worked",
+    "prediction": "pp.predicted_score"
+}
+
+# Metric -> (all workers query, single worker query), formatted once
+_ANALYTICS_QUERIES = {
+    metric: (QUERY_ALL.format(column=column), QUERY_WORKER.format(column=column))
+    for metric, column in _METRIC_COLUMNS.items()
+}
+
+# Shape of a YYYY-MM-DD date; date.fromisoformat checks it is a real day
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Analytics chart parts that are the same on every run
+_LEFT_AXIS_LABELS = [str(i) for i in range(0, 101, 10)]
+_GRID_LINES = ft.ChartGridLines(
+    interval=1,
+    color=colors.with_opacity(0.2, colors.GREY_400),
+)
+
+# Cards built up front in the developer list, and pending features per card;
+# the rest are built on request
+WORKER_PAGE_SIZE = 20
+TASK_PAGE_SIZE = 10
+
+# Seconds the developer list's rows are reused; writes here invalidate sooner
+WORKER_ROWS_TTL = 30
+
+# Simulated prediction inputs: (hours worked, efficiency rate, confidence score)
+# drawn uniformly between these bounds
+_rng = np.random.default_rng()
+_PREDICTION_LOW = (4, 70, 80)
+_PREDICTION_HIGH = (8, 95, 95)
+
+def draw_prediction_inputs() -> list:
+    """Draw hours worked, efficiency rate and confidence score in one call"""
+    # tolist() hands the driver plain floats rather than NumPy scalars
+    return _rng.uniform(_PREDICTION_LOW, _PREDICTION_HIGH).tolist()
+
+# Shadow color shared by the cards and panels
+_SHADOW_BLACK_10 = colors.with_opacity(0.1, colors.BLACK)
+
+# Runs view queries off the event handler thread
+_executor = ThreadPoolExecutor(max_workers=2)
+
+# Icon and color for each activity type, looked up together
+ACTIVITY_META = {
+    'task_completed': (ft.Icons.CHECK_CIRCLE, colors.GREEN),
+    'task_assigned': (ft.Icons.ASSIGNMENT, colors.BLUE),
+    'performance_review': (ft.Icons.STAR, colors.AMBER),
+    'training': (ft.Icons.SCHOOL, colors.PURPLE),
+    'incident': (ft.Icons.WARNING, colors.RED),
+    'leave': (ft.Icons.EVENT_BUSY, colors.ORANGE),
+    'return': (ft.Icons.EVENT_AVAILABLE, colors.TEAL)
+}
+_DEFAULT_ACTIVITY_META = (ft.Icons.INFO, colors.GREY)
+
+def activity_meta(activity_type: str) -> tuple:
+    """Get the (icon, color) pair for an activity type"""
+    return ACTIVITY_META.get(activity_type.lower(), _DEFAULT_ACTIVITY_META)
 
 def main(page: ft.Page):
     """Main application entry point"""
@@ -64,35 +128,35 @@ def main(page: ft.Page):
     auth_view = AuthView(page, db)
     logger.info("Auth view initialized")
     
+    # One View per route, created on first visit; the auth layouts inside
+    # them are reset by AuthView each time they are shown
+    route_views = {}
+    
+    def show_route_view(route: str, layout):
+        """Make the persistent View for route the only view on the page"""
+        view = route_views.get(route)
+        if view is None:
+            view = route_views[route] = ft.View(
+                route=route,
+                controls=[layout],
+                padding=0,
+            )
+        page.views[:] = [view]
+    
     def route_change(e):
         """Handle route changes"""
         try:
             route = e.route if hasattr(e, 'route') else e
-            logger.info(f"Route change to: {route}")
-            page.views.clear()
+            logger.info("Route change to: %s", route)
             
             if route == "/login":
-                logger.info("Creating login view")
-                login_view = auth_view.create_login_view()
-                page.views.append(
-                    ft.View(
-                        route="/login",
-                        controls=[login_view],
-                        padding=0,
-                    )
-                )
-                logger.info("Login view added to page")
+                logger.debug("Creating login view")
+                show_route_view("/login", auth_view.create_login_view())
+                logger.debug("Login view added to page")
             elif route == "/signup":
-                logger.info("Creating signup view")
-                signup_view = auth_view.create_signup_view()
-                page.views.append(
-                    ft.View(
-                        route="/signup",
-                        controls=[signup_view],
-                        padding=0,
-                    )
-                )
-                logger.info("Signup view added to page")
+                logger.debug("Creating signup view")
+                show_route_view("/signup", auth_view.create_signup_view())
+                logger.debug("Signup view added to page")
             else:
                 # Check if user is authenticated
                 if not auth_view.current_user:
@@ -101,20 +165,14 @@ def main(page: ft.Page):
                     return
                 
                 # Add main view
-                logger.info("Creating main view")
-                page.views.append(
-                    ft.View(
-                        route="/",
-                        controls=[main_layout],
-                        padding=0,
-                    )
-                )
-                logger.info("Main view added to page")
+                logger.debug("Creating main view")
+                show_route_view("/", main_layout)
+                logger.debug("Main view added to page")
             
             page.update()
-            logger.info("Page updated")
+            logger.debug("Page updated")
         except Exception as e:
-            logger.error(f"Route change error: {str(e)}")
+            logger.error("Route change error: %s", e)
             page.views.clear()
             page.views.append(
                 ft.View(
@@ -213,18 +271,56 @@ def main(page: ft.Page):
         expand=True,
     )
     
+    # (key, view) by navigation index, built on first visit and kept until a
+    # change to the data they show drops them through invalidate_views, or
+    # their view_key no longer matches
+    view_cache = {}
+    
+    def view_key(index):
+        """What the view for index depends on beyond the shared data"""
+        if index == 3:
+            # Settings shows the signed-in user's details
+            user = auth_view.current_user
+            return (user['id'], user['username'], user['email'])
+        return None
+    
+    def build_view(index):
+        """Build the view for a navigation rail index"""
+        if index == 0:
+            return create_dashboard()
+        elif index == 1:
+            return create_workers_view()
+        elif index == 2:
+            # Imported on first visit: the chatbot pulls in torch and transformers
+            from chatbot.chatbot_view import get_chatbot_view
+            return get_chatbot_view(page)
+        elif index == 3:
+            return create_settings_view()
+    
+    def invalidate_views(*indexes):
+        """Drop cached views so they rebuild on next visit; all of them if none given"""
+        if not indexes:
+            view_cache.clear()
+        for index in indexes:
+            view_cache.pop(index, None)
+    
     def handle_navigation(index):
         """Handle navigation rail selection"""
         try:
-            if index == 0:
-                content.content = create_dashboard()
-            elif index == 1:
-                content.content = create_workers_view()
-            elif index == 2:
-                content.content = get_chatbot_view(page)
-            elif index == 3:
-                content.content = create_settings_view()
-            page.update()
+            key = view_key(index)
+            entry = view_cache.get(index)
+            if entry is None or entry[0] != key:
+                view = build_view(index)
+                view_cache[index] = (key, view)
+            else:
+                view = entry[1]
+                if index == 0:
+                    # Pick up changes made outside this session; the etag check
+                    # keeps this to one small query when there are none
+                    start_dashboard_refresh()
+            content.content = view
+            # Only the content area changed; the rail already shows the selection
+            content.update()
         except Exception as e:
             logger.error(f"Navigation error: {str(e)}")
             show_error(f"Navigation error: {str(e)}")
@@ -237,8 +333,8 @@ def main(page: ft.Page):
     logger.info("Navigating to login view")
     page.go("/login")
     
-    def create_stat_card(title: str, value: int, icon: str, color: str) -> Card:
-        """Create a statistics card"""
+    def create_stat_card(title: str, value: Text, icon: str, color: str) -> Card:
+        """Create a statistics card around the Text that shows its value"""
         return Card(
             content=Container(
                 content=Column([
@@ -246,81 +342,179 @@ def main(page: ft.Page):
                         Icon(icon, color=color, size=30),
                         Text(title, size=16, weight=ft.FontWeight.BOLD)
                     ], spacing=10),
-                    Text(str(value), size=24, weight=ft.FontWeight.BOLD)
+                    value
                 ], spacing=10),
                 padding=20
             ),
             elevation=2,
-            shadow_color=colors.with_opacity(0.1, colors.BLACK),
+            shadow_color=_SHADOW_BLACK_10,
             expand=True
         )
     
-    def create_dashboard():
+    def create_activity_card(activity) -> Card:
+        """Create a card for one recent activity"""
+        icon, color = activity_meta(activity['activity_type'])
+        return Card(
+            content=Container(
+                content=Row([
+                    Icon(icon, color=color, size=30),
+                    Column([
+                        Text(activity['description'], size=16),
+                        Text(f"Developer: {activity['worker_name'] or 'Unknown'}", 
+                             size=12, 
+                             color=colors.GREY_700)
+                    ], spacing=5)
+                ], spacing=10),
+                padding=15
+            ),
+            elevation=1,
+            shadow_color=_SHADOW_BLACK_10
+        )
+    
+    # Dashboard controls, built once by build_dashboard; create_dashboard
+    # refreshes their data and hands back the same view
+    dashboard = {}
+    
+    def build_dashboard():
+        """Build the static dashboard layout"""
+        dashboard['total'] = Text("0", size=24, weight=ft.FontWeight.BOLD)
+        dashboard['active'] = Text("0", size=24, weight=ft.FontWeight.BOLD)
+        dashboard['high_perf'] = Text("0", size=24, weight=ft.FontWeight.BOLD)
+        
+        # Create statistics cards
+        stats_row = Row([
+            create_stat_card("Total Developers", dashboard['total'], ft.Icons.PEOPLE, colors.BLUE),
+            create_stat_card("Active Developers", dashboard['active'], ft.Icons.PERSON, colors.GREEN),
+            create_stat_card("High Performance", dashboard['high_perf'], ft.Icons.STAR, colors.AMBER)
+        ], spacing=20)
+        
+        # Shown while create_dashboard's query is in flight
+        dashboard['loading'] = ft.ProgressBar(visible=False)
+        
+        # Create activity list with enhanced styling; ListView only renders
+        # the cards in view
+        dashboard['activities'] = ListView(spacing=10, padding=0, expand=True)
+        
+        # Create main dashboard layout
+        dashboard['view'] = Container(
+            content=Column([
+                # Header
+                Container(
+                    content=Text("Dashboard", size=30, weight=ft.FontWeight.BOLD),
+                    padding=ft.padding.only(bottom=20)
+                ),
+                dashboard['loading'],
+                # Statistics cards
+                Container(
+                    content=stats_row,
+                    padding=ft.padding.only(bottom=20)
+                ),
+                # Activity list
+                Container(
+                    content=Text("Recent Activities", size=20, weight=ft.FontWeight.BOLD),
+                    padding=ft.padding.only(bottom=10)
+                ),
+                dashboard['activities']
+            ], spacing=0),
+            expand=True
+        )
+    
+    def fetch_dashboard_etag():
+        """Fetch a cheap fingerprint of everything the dashboard shows"""
+        # MAX() on the indexed timestamps catches inserts and edits; the
+        # count catches deletes. The probe runs on a long-lived executor
+        # thread, so make sure it isn't reading from an old snapshot.
+        db.end_snapshot()
+        row = db.fetch_one("""
+            SELECT (SELECT MAX(updated_at) FROM workers) AS workers_changed,
+                   (SELECT COUNT(*) FROM workers) AS workers,
+                   (SELECT MAX(created_at) FROM activities) AS activities_changed
+        """)
+        return tuple(row.values())
+    
+    def fetch_dashboard_stats():
+        """Fetch all dashboard statistics in one pass over workers"""
+        return db.fetch_one("""
+            SELECT COUNT(*) AS total,
+                   SUM(status = 'active') AS active,
+                   SUM(performance_score >= 8.0) AS high_perf
+            FROM workers
+        """)
+    
+    def fetch_recent_activities():
+        """Fetch recent activities with their developer's current name"""
+        # The name stored on the activity covers developers deleted since
+        return db.fetch_all("""
+            SELECT a.activity_type, a.description,
+                   COALESCE(w.name, a.worker_name) AS worker_name
+            FROM activities a
+            LEFT JOIN workers w ON w.id = a.worker_id
+            ORDER BY a.created_at DESC
+            LIMIT 5
+        """)
+    
+    def apply_dashboard_data(stats_future, activities_future, etag):
+        """Fill the dashboard controls once both dashboard queries finish"""
         try:
-            # Get statistics
-            total_workers = db.fetch_one("SELECT COUNT(*) as count FROM workers")['count']
-            active_workers = db.fetch_one("SELECT COUNT(*) as count FROM workers WHERE status = 'active'")['count']
-            high_performance = db.fetch_one("SELECT COUNT(*) as count FROM workers WHERE performance_score >= 8.0")['count']
-            
-            # Get recent activities
-            activities = db.fetch_all("SELECT * FROM activities ORDER BY created_at DESC LIMIT 5")
-            
-            # Get worker names
-            workers = {w['id']: w['name'] for w in db.fetch_all("SELECT id, name FROM workers")}
-            
-            # Create statistics cards
-            stats_row = Row([
-                create_stat_card("Total Developers", total_workers, ft.Icons.PEOPLE, colors.BLUE),
-                create_stat_card("Active Developers", active_workers, ft.Icons.PERSON, colors.GREEN),
-                create_stat_card("High Performance", high_performance, ft.Icons.STAR, colors.AMBER)
-            ], spacing=20)
+            stats = stats_future.result()
+            activities = activities_future.result()
+            dashboard['etag'] = etag
             
-            # Create activity list with enhanced styling
-            activity_list = Column([
-                Text("Recent Activities", size=20, weight=ft.FontWeight.BOLD),
-                *[
-                    Card(
-                        content=Container(
-                            content=Row([
-                                Icon(get_activity_icon(activity['activity_type']), 
-                                     color=get_activity_color(activity['activity_type']), 
-                                     size=30),
-                                Column([
-                                    Text(activity['description'], size=16),
-                                    Text(f"Developer: {workers.get(activity['worker_id'], 'Unknown')}", 
-                                         size=12, 
-                                         color=colors.GREY_700)
-                                ], spacing=5)
-                            ], spacing=10),
-                            padding=15
-                        ),
-                        elevation=1,
-                        shadow_color=colors.with_opacity(0.1, colors.BLACK)
-                    ) for activity in activities
-                ]
-            ], spacing=10)
+            # Only the data-bearing controls change between builds
+            dashboard['total'].value = str(stats['total'])
+            dashboard['active'].value = str(int(stats['active'] or 0))
+            dashboard['high_perf'].value = str(int(stats['high_perf'] or 0))
+            dashboard['activities'].controls = [
+                create_activity_card(activity) for activity in activities
+            ]
+        except Exception as e:
+            logger.error(f"Error loading dashboard: {e}")
+            dashboard['activities'].controls = [
+                Text("Error loading dashboard", color=colors.RED)
+            ]
+        finish_dashboard_refresh()
+    
+    def finish_dashboard_refresh():
+        """Hide the progress bar and send the dashboard's changes"""
+        dashboard['loading'].visible = False
+        # Not on the page yet if the data beat handle_navigation; it will
+        # then be sent with the content area
+        if dashboard['view'].page:
+            dashboard['view'].update()
+    
+    def refresh_dashboard():
+        """Reload the dashboard data unless its etag shows nothing changed"""
+        try:
+            etag = fetch_dashboard_etag()
+        except Exception as e:
+            logger.error(f"Error checking dashboard etag: {e}")
+            etag = None
+        if etag is not None and etag == dashboard.get('etag'):
+            finish_dashboard_refresh()
+            return
+        
+        # The queries are independent, so each runs on its own pooled
+        # connection; the chained callbacks apply them exactly once
+        stats = _executor.submit(fetch_dashboard_stats)
+        activities = _executor.submit(fetch_recent_activities)
+        stats.add_done_callback(lambda _: activities.add_done_callback(
+            lambda _: apply_dashboard_data(stats, activities, etag)
+        ))
+    
+    def start_dashboard_refresh():
+        """Show the current dashboard now and refresh it in the background"""
+        dashboard['loading'].visible = True
+        _executor.submit(refresh_dashboard)
+    
+    def create_dashboard():
+        try:
+            if not dashboard:
+                build_dashboard()
             
-            # Create main dashboard layout
-            return Container(
-                content=Column([
-                    # Header
-                    Container(
-                        content=Text("Dashboard", size=30, weight=ft.FontWeight.BOLD),
-                        padding=ft.padding.only(bottom=20)
-                    ),
-                    # Statistics cards
-                    Container(
-                        content=stats_row,
-                        padding=ft.padding.only(bottom=20)
-                    ),
-                    # Activity list
-                    Container(
-                        content=activity_list,
-                        expand=True
-                    )
-                ], spacing=0),
-                expand=True
-            )
+            # Built fresh or invalidated by a change made here: always reload
+            dashboard.pop('etag', None)
+            start_dashboard_refresh()
+            return dashboard['view']
         except Exception as e:
             logger.error(f"Error creating dashboard: {e}")
             return Container(
@@ -396,16 +590,15 @@ def main(page: ft.Page):
                 shadow=ft.BoxShadow(
                     spread_radius=1,
                     blur_radius=15,
-                    color=colors.with_opacity(0.1, colors.BLACK),
+                    color=_SHADOW_BLACK_10,
                 )
             )
             
             def validate_date(date_str: str) -> bool:
                 """Validate date format (YYYY-MM-DD)"""
                 try:
-                    from datetime import datetime
-                    datetime.strptime(date_str, '%Y-%m-%d')
-                    return True
+                    # fromisoformat also takes forms like 20250101, so check the shape first
+                    return bool(_DATE_RE.match(date_str)) and bool(date.fromisoformat(date_str))
                 except ValueError:
                     return False
             
@@ -424,60 +617,56 @@ def main(page: ft.Page):
                     metric = metrics_dropdown.value
                     worker_id = task_worker_dropdown.value
                     
-                    # Map metric to database column
-                    metric_columns = {
-                        "performance": "w.performance_score",
-                        "efficiency": "pp.efficiency_rate",
-                        "tasks": "w.tasks_completed",
-                        "hours": "pp.hours_worked",
-                        "prediction": "pp.predicted_score"
-                    }
-                    
-                    column = metric_columns[metric]
+                    queries = _ANALYTICS_QUERIES.get(metric)
+                    if queries is None:
+                        show_error("Please select a metric")
+                        return
                     
-                    # Build query based on selected worker
-                    worker_filter = f"AND w.id = {worker_id}" if worker_id else ""
+                    # Pick the query shape for the selected worker; the worker id
+                    # is bound as a parameter, never formatted into the SQL
+                    query_all, query_worker = queries
+                    if worker_id:
+                        query = query_worker
+                        params = (start_date.value, end_date.value, int(worker_id))
+                    else:
+                        query = query_all
+                        params = (start_date.value, end_date.value)
                     
                     # Fetch historical data
-                    query = f"""
-                        SELECT 
-                            DATE(pp.created_at) as date,
-                            AVG({column}) as value,
-                            AVG(pp.confidence_score) as confidence,
-                            COUNT(DISTINCT t.id) as total_tasks,
-                            SUM(CASE WHEN t.is_completed = 1 THEN 1 ELSE 0 END) as completed_tasks
-                        FROM workers w
-                        LEFT JOIN performance_predictions pp ON w.id = pp.worker_id
-                        LEFT JOIN tasks t ON w.id = t.worker_id
-                        WHERE pp.created_at BETWEEN %s AND %s {worker_filter}
-                        GROUP BY DATE(pp.created_at)
-                        ORDER BY date
-                    """
-                    historical_data = db.fetch_all(query, (start_date.value, end_date.value))
+                    historical_data = db.fetch_all(query, params, prepared=True)
                     
                     if not historical_data:
                         show_error("No data available for the selected date range")
                         return
                     
-                    # Calculate simple moving average as prediction
+                    # Collect the series and the statistics in one pass over the rows
+                    series = []
+                    confidence_sum = 0
+                    total_tasks = 0
+                    completed_tasks = 0
+                    for d in historical_data:
+                        series.append(d['value'])
+                        confidence_sum += d['confidence']
+                        total_tasks += d['total_tasks']
+                        completed_tasks += d['completed_tasks']
+                    values = np.array(series, dtype=np.float64)
+                    
+                    # Calculate simple moving average as prediction: each day is
+                    # predicted by the mean of the window_size days before it
                     window_size = 3
-                    predictions = []
-                    for i in range(len(historical_data)):
-                        if i < window_size:
-                            predictions.append(None)
-                        else:
-                            window = historical_data[i-window_size:i]
-                            avg = sum(d['value'] for d in window) / window_size
-                            predictions.append(avg)
+                    predictions = [None] * min(len(values), window_size)
+                    if len(values) > window_size:
+                        kernel = np.full(window_size, 1.0 / window_size)
+                        predictions += np.convolve(values[:-1], kernel, mode='valid').tolist()
                     
-                    # Create chart data
+                    # Create chart data; x positions and both series are already
+                    # Python floats, converted in bulk by tolist()
+                    xs = np.arange(len(values), dtype=np.float64).tolist()
                     chart_data = [
                         ft.LineChartData(
                             data_points=[
-                                ft.LineChartDataPoint(
-                                    x=float(i),
-                                    y=float(d['value'])
-                                ) for i, d in enumerate(historical_data)
+                                ft.LineChartDataPoint(x=x, y=y)
+                                for x, y in zip(xs, values.tolist())
                             ],
                             stroke_width=2,
                             color=colors.BLUE,
@@ -486,10 +675,8 @@ def main(page: ft.Page):
                         ),
                         ft.LineChartData(
                             data_points=[
-                                ft.LineChartDataPoint(
-                                    x=float(i),
-                                    y=float(p) if p is not None else None
-                                ) for i, p in enumerate(predictions)
+                                ft.LineChartDataPoint(x=x, y=y)
+                                for x, y in zip(xs, predictions)
                             ],
                             stroke_width=2,
                             color=colors.RED,
@@ -499,25 +686,17 @@ def main(page: ft.Page):
                     ]
                     
                     # Calculate statistics
-                    avg_confidence = sum(d['confidence'] for d in historical_data) / len(historical_data)
-                    total_tasks = sum(d['total_tasks'] for d in historical_data)
-                    completed_tasks = sum(d['completed_tasks'] for d in historical_data)
+                    avg_confidence = confidence_sum / len(historical_data)
                     completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
                     
                     # Create chart
                     chart = ft.LineChart(
                         data_series=chart_data,
                         border=ft.border.all(1, colors.GREY_400),
-                        horizontal_grid_lines=ft.ChartGridLines(
-                            interval=1,
-                            color=colors.with_opacity(0.2, colors.GREY_400),
-                        ),
-                        vertical_grid_lines=ft.ChartGridLines(
-                            interval=1,
-                            color=colors.with_opacity(0.2, colors.GREY_400),
-                        ),
+                        horizontal_grid_lines=_GRID_LINES,
+                        vertical_grid_lines=_GRID_LINES,
                         left_axis=ft.ChartAxis(
-                            labels=[str(i) for i in range(0, 101, 10)],
+                            labels=_LEFT_AXIS_LABELS,
                             labels_size=40,
                         ),
                         bottom_axis=ft.ChartAxis(
@@ -579,7 +758,7 @@ def main(page: ft.Page):
                             shadow=ft.BoxShadow(
                                 spread_radius=1,
                                 blur_radius=15,
-                                color=colors.with_opacity(0.1, colors.BLACK),
+                                color=_SHADOW_BLACK_10,
                             )
                         ),
                         ft.Text("Blue line: Historical Data", color=colors.BLUE),
@@ -592,48 +771,35 @@ def main(page: ft.Page):
                     logger.error(f"Error generating analytics: {str(e)}")
                     show_error(str(e))
             
-            return ft.Container(
-                content=ft.ListView(
-                    controls=[
-                        ft.Text("Analytics & Predictions", size=30, weight=ft.FontWeight.BOLD),
-                        ft.Container(
-                            content=ft.Card(
-                                content=ft.Container(
-                                    content=ft.Column([
-                                        ft.Text("Generate Analytics", size=20, weight=ft.FontWeight.BOLD),
-                                        ft.Row([start_date, end_date], spacing=20),
-                                        ft.Row([task_worker_dropdown, metrics_dropdown], spacing=20),
-                                        ft.ElevatedButton(
-                                            "Generate Analytics",
-                                            icon=ft.Icons.ANALYTICS,
-                                            on_click=generate_analytics,
-                                            style=ft.ButtonStyle(
-                                                color=colors.WHITE,
-                                                bgcolor=colors.BLUE,
-                                                shape=ft.RoundedRectangleBorder(radius=10)
-                                            )
-                                        )
-                                    ]),
-                                    padding=20
-                                ),
-                                elevation=2,
-                                shadow_color=colors.with_opacity(0.1, colors.BLACK)
-                            ),
-                            padding=20,
-                            bgcolor=colors.WHITE,
-                            border_radius=10,
-                            shadow=ft.BoxShadow(
-                                spread_radius=1,
-                                blur_radius=15,
-                                color=colors.with_opacity(0.1, colors.BLACK),
-                            )
+            return ft.ListView(
+                controls=[
+                    ft.Text("Analytics & Predictions", size=30, weight=ft.FontWeight.BOLD),
+                    ft.Card(
+                        content=ft.Container(
+                            content=ft.Column([
+                                ft.Text("Generate Analytics", size=20, weight=ft.FontWeight.BOLD),
+                                ft.Row([start_date, end_date], spacing=20),
+                                ft.Row([task_worker_dropdown, metrics_dropdown], spacing=20),
+                                ft.ElevatedButton(
+                                    "Generate Analytics",
+                                    icon=ft.Icons.ANALYTICS,
+                                    on_click=generate_analytics,
+                                    style=ft.ButtonStyle(
+                                        color=colors.WHITE,
+                                        bgcolor=colors.BLUE,
+                                        shape=ft.RoundedRectangleBorder(radius=10)
+                                    )
+                                )
+                            ]),
+                            padding=20
                         ),
-                        prediction_results
-                    ],
-                    spacing=20,
-                    padding=20,
-                    expand=True
-                ),
+                        elevation=2,
+                        shadow_color=_SHADOW_BLACK_10
+                    ),
+                    prediction_results
+                ],
+                spacing=20,
+                padding=20,
                 expand=True
             )
             
@@ -703,7 +869,7 @@ def main(page: ft.Page):
             selected_worker = None
             
             def update_worker_dropdown():
-                """Update the worker dropdown options"""
+                """Update the worker dropdown options; the caller sends the update"""
                 try:
                     workers = db.fetch_all("SELECT id, name FROM workers ORDER BY name")
                     task_worker_dropdown.options = [
@@ -712,119 +878,217 @@ def main(page: ft.Page):
                     ]
                     if workers:
                         task_worker_dropdown.value = str(workers[0]['id'])
-                    page.update()
                 except Exception as e:
                     logger.error(f"Error updating worker dropdown: {str(e)}")
                     show_error("Failed to update worker list")
             
+            def add_more_button(list_view, items, page_size, build, label):
+                """Append a button that builds the next page_size items of list_view"""
+                shown = len(list_view.controls)
+                if shown >= len(items):
+                    return
+                
+                def show_more(e):
+                    list_view.controls.pop()
+                    list_view.controls.extend(build(item) for item in items[shown:shown + page_size])
+                    add_more_button(list_view, items, page_size, build, label)
+                    list_view.update()
+                
+                list_view.controls.append(ft.TextButton(
+                    f"Show more {label} ({len(items) - shown} remaining)",
+                    on_click=show_more
+                ))
+            
+            def build_task_row(worker, task):
+                """Build the row for one pending task"""
+                return ft.Container(
+                    content=ft.Row([
+                        ft.Column([
+                            ft.Text(task['task_description'], size=14),
+                            ft.Text(f"Created: {task['created_at']}", size=12, color=colors.GREY_400)
+                        ], spacing=5),
+                        ft.ElevatedButton(
+                            "Done",
+                            icon=ft.Icons.CHECK_CIRCLE,
+                            data=(worker['id'], task['id']),
+                            on_click=on_done_click,
+                            style=ft.ButtonStyle(
+                                color=colors.WHITE,
+                                bgcolor=colors.GREEN,
+                                shape=ft.RoundedRectangleBorder(radius=10)
+                            )
+                        )
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    padding=10,
+                    bgcolor=colors.BLUE_GREY_800,
+                    border_radius=5
+                )
+            
+            # Rows behind the cards on screen, refreshed by load_workers; the
+            # card buttons carry ids and look their rows up here
+            workers_by_id = {}
+            tasks_by_id = {}
+            
+            def on_done_click(e):
+                worker_id, task_id = e.control.data
+                complete_task(workers_by_id[worker_id], tasks_by_id[task_id])
+            
+            def on_edit_click(e):
+                edit_worker(workers_by_id[e.control.data])
+            
+            def on_delete_click(e):
+                delete_worker(workers_by_id[e.control.data])
+            
+            # Worker id -> (signature, card) for the cards built so far
+            worker_cards = {}
+            
+            def worker_signature(worker):
+                """Everything a worker's card shows or hands to its buttons"""
+                return (
+                    worker['name'], worker['role'], worker['status'],
+                    worker['performance_score'], worker['tasks_completed'],
+                    worker['total_tasks'], worker['avg_efficiency'],
+                    tuple(task['id'] for task in worker['incomplete_tasks'])
+                )
+            
+            def build_worker_card(worker):
+                """Get the card for one worker, reusing the last one if nothing it shows changed"""
+                signature = worker_signature(worker)
+                entry = worker_cards.get(worker['id'])
+                if entry is not None and entry[0] == signature:
+                    return entry[1]
+                card = create_worker_card(worker)
+                worker_cards[worker['id']] = (signature, card)
+                return card
+            
+            def create_worker_card(worker):
+                """Build the card for one worker"""
+                # Create task list
+                if worker['incomplete_tasks']:
+                    tasks = worker['incomplete_tasks']
+                    task_list = ft.ListView(
+                        controls=[build_task_row(worker, task) for task in tasks[:TASK_PAGE_SIZE]],
+                        spacing=5,
+                        height=200
+                    )
+                    add_more_button(task_list, tasks, TASK_PAGE_SIZE,
+                                    lambda task: build_task_row(worker, task), "features")
+                else:
+                    task_list = ft.Text("No pending features", color=colors.GREY_400)
+                
+                # Create worker card
+                return ft.Card(
+                    content=ft.Container(
+                        content=ft.Column([
+                            ft.Row([
+                                ft.Text(worker['name'], size=20, weight=ft.FontWeight.BOLD),
+                                ft.Container(
+                                    content=ft.Text(
+                                        worker['status'].upper(),
+                                        color=colors.WHITE,
+                                        size=12
+                                    ),
+                                    bgcolor=colors.GREEN if worker['status'] == 'active' else colors.RED,
+                                    padding=5,
+                                    border_radius=5
+                                )
+                            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                            ft.Text(f"Role: {worker['role']}", size=16),
+                            ft.Text(f"Code Quality Score: {worker['performance_score']:.1f}", size=16),
+                            ft.Text(f"Features Completed: {worker['tasks_completed']}/{worker['total_tasks']}", size=16),
+                            ft.Text(f"Development Efficiency: {worker['avg_efficiency']:.1f}%", size=16),
+                            ft.Text("Pending Features:", size=16, weight=ft.FontWeight.BOLD),
+                            task_list,
+                            ft.Row([
+                                ft.ElevatedButton(
+                                    "Edit",
+                                    icon=ft.Icons.EDIT,
+                                    data=worker['id'],
+                                    on_click=on_edit_click
+                                ),
+                                ft.ElevatedButton(
+                                    "Delete",
+                                    icon=ft.Icons.DELETE,
+                                    data=worker['id'],
+                                    on_click=on_delete_click,
+                                    color=colors.RED
+                                )
+                            ], alignment=ft.MainAxisAlignment.END)
+                        ], spacing=10),
+                        padding=20
+                    ),
+                    elevation=2
+                )
+            
+            def fetch_worker_rows():
+                """Fetch every worker with its task counts, efficiency and incomplete tasks"""
+                # Get all workers with their task counts and efficiency. Each
+                # figure is its own lookup on a worker_id index; joining both
+                # tables at once would pair every task with every prediction.
+                workers = db.fetch_all("""
+                    SELECT 
+                        w.id, w.name, w.role, w.status, w.performance_score, w.tasks_completed,
+                        (SELECT COUNT(*) FROM tasks t WHERE t.worker_id = w.id) as total_tasks,
+                        COALESCE((SELECT AVG(pp.efficiency_rate)
+                                  FROM performance_predictions pp
+                                  WHERE pp.worker_id = w.id), 0) as avg_efficiency,
+                        (SELECT COUNT(*) FROM performance_predictions pp
+                         WHERE pp.worker_id = w.id) as prediction_count
+                    FROM workers w
+                    ORDER BY w.name
+                """)
+                
+                # Get every worker's incomplete tasks in one query, newest first
+                incomplete_by_worker = {}
+                for task in db.fetch_all("""
+                    SELECT id, worker_id, task_description, created_at
+                    FROM tasks
+                    WHERE is_completed = 0
+                    ORDER BY created_at DESC
+                """):
+                    incomplete_by_worker.setdefault(task['worker_id'], []).append(task)
+                for worker in workers:
+                    worker['incomplete_tasks'] = incomplete_by_worker.get(worker['id'], [])
+                return workers
+            
+            def replace_worker_card(worker):
+                """Swap a worker's card in the list on screen for one built from its row"""
+                entry = worker_cards.get(worker['id'])
+                card = build_worker_card(worker)
+                worker_list = workers_section.content
+                if entry is None or not isinstance(worker_list, ft.ListView):
+                    return
+                if entry[1] in worker_list.controls:
+                    worker_list.controls[worker_list.controls.index(entry[1])] = card
+                    worker_list.update()
+            
             def load_workers():
                 """Load and display workers with their tasks"""
                 try:
-                    # Get all workers with their task counts and efficiency
-                    workers = db.fetch_all("""
-                        SELECT 
-                            w.*,
-                            COALESCE(COUNT(DISTINCT t.id), 0) as total_tasks,
-                            COALESCE(SUM(CASE WHEN t.is_completed = 1 THEN 1 ELSE 0 END), 0) as completed_tasks,
-                            COALESCE(AVG(pp.efficiency_rate), 0) as avg_efficiency
-                        FROM workers w
-                        LEFT JOIN tasks t ON w.id = t.worker_id
-                        LEFT JOIN performance_predictions pp ON w.id = pp.worker_id
-                        GROUP BY w.id, w.name, w.role, w.status, w.performance_score, w.created_at, w.tasks_completed, w.tasks_to_complete
-                        ORDER BY w.name
-                    """)
+                    # Reused until a write in this view invalidates "worker_rows"
+                    workers = cached("worker_rows", WORKER_ROWS_TTL, fetch_worker_rows)
                     
-                    # Get incomplete tasks for each worker
-                    for worker in workers:
-                        incomplete_tasks = db.fetch_all("""
-                            SELECT id, task_description, created_at
-                            FROM tasks
-                            WHERE worker_id = %s AND is_completed = 0
-                            ORDER BY created_at DESC
-                        """, (worker['id'],))
-                        worker['incomplete_tasks'] = incomplete_tasks
+                    workers_by_id.clear()
+                    workers_by_id.update((w['id'], w) for w in workers)
+                    tasks_by_id.clear()
+                    tasks_by_id.update(
+                        (task['id'], task) for w in workers for task in w['incomplete_tasks']
+                    )
                     
-                    # Create worker cards
-                    worker_cards = []
-                    for worker in workers:
-                        # Create task list
-                        task_list = ft.ListView(
-                            controls=[
-                                ft.Container(
-                                    content=ft.Row([
-                                        ft.Column([
-                                            ft.Text(task['task_description'], size=14),
-                                            ft.Text(f"Created: {task['created_at']}", size=12, color=colors.GREY_400)
-                                        ], spacing=5),
-                                        ft.ElevatedButton(
-                                            "Done",
-                                            icon=ft.Icons.CHECK_CIRCLE,
-                                            on_click=lambda e, t=task, w=worker: complete_task(w, t),
-                                            style=ft.ButtonStyle(
-                                                color=colors.WHITE,
-                                                bgcolor=colors.GREEN,
-                                                shape=ft.RoundedRectangleBorder(radius=10)
-                                            )
-                                        )
-                                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                                    padding=10,
-                                    bgcolor=colors.BLUE_GREY_800,
-                                    border_radius=5
-                                ) for task in worker['incomplete_tasks']
-                            ],
-                            spacing=5,
-                            height=200
-                        ) if worker['incomplete_tasks'] else ft.Text("No pending features", color=colors.GREY_400)
-                        
-                        # Create worker card
-                        worker_card = ft.Card(
-                            content=ft.Container(
-                                content=ft.Column([
-                                    ft.Row([
-                                        ft.Text(worker['name'], size=20, weight=ft.FontWeight.BOLD),
-                                        ft.Container(
-                                            content=ft.Text(
-                                                worker['status'].upper(),
-                                                color=colors.WHITE,
-                                                size=12
-                                            ),
-                                            bgcolor=colors.GREEN if worker['status'] == 'active' else colors.RED,
-                                            padding=5,
-                                            border_radius=5
-                                        )
-                                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                                    ft.Text(f"Role: {worker['role']}", size=16),
-                                    ft.Text(f"Code Quality Score: {worker['performance_score']:.1f}", size=16),
-                                    ft.Text(f"Features Completed: {worker['tasks_completed']}/{worker['total_tasks']}", size=16),
-                                    ft.Text(f"Development Efficiency: {worker['avg_efficiency']:.1f}%", size=16),
-                                    ft.Text("Pending Features:", size=16, weight=ft.FontWeight.BOLD),
-                                    task_list,
-                                    ft.Row([
-                                        ft.ElevatedButton(
-                                            "Edit",
-                                            icon=ft.Icons.EDIT,
-                                            on_click=lambda e, w=worker: edit_worker(w)
-                                        ),
-                                        ft.ElevatedButton(
-                                            "Delete",
-                                            icon=ft.Icons.DELETE,
-                                            on_click=lambda e, w=worker: delete_worker(w),
-                                            color=colors.RED
-                                        )
-                                    ], alignment=ft.MainAxisAlignment.END)
-                                ], spacing=10),
-                                padding=20
-                            ),
-                            elevation=2
-                        )
-                        worker_cards.append(worker_card)
+                    # Forget cards of workers that are gone
+                    for worker_id in worker_cards.keys() - workers_by_id.keys():
+                        del worker_cards[worker_id]
                     
-                    return ft.ListView(
-                        controls=worker_cards,
+                    # Build only the first page of cards; the rest are built
+                    # when asked for
+                    worker_list = ft.ListView(
+                        controls=[build_worker_card(w) for w in workers[:WORKER_PAGE_SIZE]],
                         spacing=20,
                         padding=20,
                         expand=True
                     )
+                    add_more_button(worker_list, workers, WORKER_PAGE_SIZE, build_worker_card, "developers")
+                    return worker_list
                 except Exception as e:
                     logger.error(f"Error loading workers: {str(e)}")
                     return ft.Text("Error loading workers", color=colors.RED)
@@ -832,32 +1096,24 @@ def main(page: ft.Page):
             def complete_task(worker, task):
                 """Complete a task for the worker"""
                 try:
-                    # Start transaction
-                    db.execute_query("START TRANSACTION")
+                    # Generate new performance prediction
+                    hours_worked, efficiency_rate, confidence_score = draw_prediction_inputs()
+                    predicted_score = (efficiency_rate + worker['performance_score']) / 2
                     
-                    try:
-                        # Update task status
-                        db.execute_query("""
+                    # Mark the task done, count it, record the prediction and log
+                    # the activity as one transaction
+                    db.execute_batch([
+                        ("""
                             UPDATE tasks 
                             SET is_completed = 1
                             WHERE id = %s
-                        """, (task['id'],))
-                        
-                        # Update worker's tasks_completed count
-                        db.execute_query("""
+                        """, (task['id'],)),
+                        ("""
                             UPDATE workers 
                             SET tasks_completed = tasks_completed + 1
                             WHERE id = %s
-                        """, (worker['id'],))
-                        
-                        # Generate new performance prediction
-                        import random
-                        hours_worked = random.uniform(4, 8)
-                        efficiency_rate = random.uniform(70, 95)
-                        predicted_score = (efficiency_rate + worker['performance_score']) / 2
-                        confidence_score = random.uniform(80, 95)
-                        
-                        db.execute_query("""
+                        """, (worker['id'],)),
+                        ("""
                             INSERT INTO performance_predictions 
                             (worker_id, hours_worked, tasks_completed, efficiency_rate, 
                              predicted_score, confidence_score)
@@ -869,44 +1125,52 @@ def main(page: ft.Page):
                             efficiency_rate,
                             predicted_score,
                             confidence_score
-                        ))
-                        
-                        # Add activity record
-                        db.execute_query("""
+                        )),
+                        ("""
                             INSERT INTO activities 
-                            (worker_id, activity_type, description)
-                            VALUES (%s, %s, %s)
+                            (worker_id, activity_type, description, worker_name)
+                            VALUES (%s, %s, %s, %s)
                         """, (
                             worker['id'],
                             'task_completed',
-                            f"Completed feature: {task['task_description']}"
+                            f"Completed feature: {task['task_description']}",
+                            worker['name']
                         ))
-                        
-                        # Commit transaction
-                        db.execute_query("COMMIT")
-                        
-                        # Refresh workers table
-                        workers_table = load_workers()
-                        workers_section.content = workers_table
-                        page.update()
-                        
-                    except Exception as e:
-                        # Rollback transaction on error
-                        db.execute_query("ROLLBACK")
-                        raise e
+                    ])
+                    invalidate("worker_stats", "recent_activities")
+                    invalidate_views(0)  # Dashboard
+                    
+                    # Apply the known changes to the worker's cached row and
+                    # swap in its card, instead of reloading the whole list
+                    count = worker['prediction_count']
+                    worker['avg_efficiency'] = (worker['avg_efficiency'] * count + efficiency_rate) / (count + 1)
+                    worker['prediction_count'] = count + 1
+                    worker['tasks_completed'] += 1
+                    worker['incomplete_tasks'] = [
+                        t for t in worker['incomplete_tasks'] if t['id'] != task['id']
+                    ]
+                    tasks_by_id.pop(task['id'], None)
+                    replace_worker_card(worker)
                     
                 except Exception as e:
                     logger.error(f"Error completing task: {str(e)}")
                     show_error(str(e))
             
-            def clear_form():
+            # The developer form's fields, updated together
+            form_fields = (name_field, role_field, status_dropdown, performance_field)
+            
+            def reset_form():
+                """Reset the developer form without sending an update"""
                 nonlocal selected_worker
                 name_field.value = ""
                 role_field.value = ""
                 status_dropdown.value = "active"
                 performance_field.value = "0.0"
                 selected_worker = None
-                page.update()
+            
+            def clear_form():
+                reset_form()
+                page.update(*form_fields)
             
             def submit_worker(e):
                 try:
@@ -935,12 +1199,15 @@ def main(page: ft.Page):
                             float(performance_field.value)
                         ))
                     
-                    # Refresh workers table and dropdown
-                    workers_table = load_workers()
-                    workers_section.content = workers_table
+                    invalidate("worker_stats", "worker_rows")
+                    invalidate_views(0)
+                    
+                    # Refresh workers table and dropdown, then send every change
+                    # in one update
+                    workers_section.content = load_workers()
                     update_worker_dropdown()
-                    clear_form()
-                    page.update()
+                    reset_form()
+                    page.update(workers_section, task_worker_dropdown, *form_fields)
                     
                 except Exception as e:
                     logger.error(f"Error submitting worker: {str(e)}")
@@ -954,34 +1221,21 @@ def main(page: ft.Page):
                 role_field.value = worker['role']
                 status_dropdown.value = worker['status']
                 performance_field.value = str(worker['performance_score'])
-                page.update()
+                page.update(*form_fields)
             
             def delete_worker(worker):
                 """Delete a worker"""
                 def confirm_delete(e):
                     try:
-                        # Start transaction
-                        db.execute_query("START TRANSACTION")
+                        # Tasks and predictions cascade with the worker; its
+                        # activities are kept with the worker cleared
+                        db.execute_query("DELETE FROM workers WHERE id = %s", (worker['id'],))
+                        invalidate("worker_stats", "recent_activities", "worker_rows")
+                        invalidate_views(0)
                         
-                        try:
-                            # Delete related records first
-                            db.execute_query("DELETE FROM performance_predictions WHERE worker_id = %s", (worker['id'],))
-                            db.execute_query("DELETE FROM tasks WHERE worker_id = %s", (worker['id'],))
-                            db.execute_query("DELETE FROM workers WHERE id = %s", (worker['id'],))
-                            
-                            # Commit transaction
-                            db.execute_query("COMMIT")
-                            
-                            # Refresh UI
-                            workers_table = load_workers()
-                            workers_section.content = workers_table
-                            update_worker_dropdown()
-                            page.update()
-                            
-                        except Exception as e:
-                            # Rollback transaction on error
-                            db.execute_query("ROLLBACK")
-                            raise e
+                        # Refresh UI; the update that closes the dialog sends it
+                        workers_section.content = load_workers()
+                        update_worker_dropdown()
                             
                     except Exception as e:
                         logger.error(f"Error deleting worker: {str(e)}")
@@ -1014,74 +1268,49 @@ def main(page: ft.Page):
                     
                     worker_id = int(task_worker_dropdown.value)
                     
-                    # Start transaction
-                    db.execute_query("START TRANSACTION")
+                    if not db.fetch_one("SELECT id FROM workers WHERE id = %s", (worker_id,)):
+                        raise Exception("Worker not found")
                     
-                    try:
-                        # Get worker's current stats
-                        worker = db.fetch_one("""
-                            SELECT 
-                                performance_score,
-                                tasks_completed,
-                                tasks_to_complete
-                            FROM workers 
-                            WHERE id = %s
-                            FOR UPDATE
-                        """, (worker_id,))
-                        
-                        if not worker:
-                            raise Exception("Worker not found")
-                        
-                        # Add task
-                        db.execute_query("""
+                    # Generate performance prediction
+                    hours_worked, efficiency_rate, confidence_score = draw_prediction_inputs()
+                    
+                    # Add the task, record a prediction from the worker's current
+                    # stats and count the task as one transaction; INSERT ...
+                    # SELECT reads the stats inside it, so no FOR UPDATE read is
+                    # needed first
+                    db.execute_batch([
+                        ("""
                             INSERT INTO tasks (worker_id, task_description, is_completed)
                             VALUES (%s, %s, 0)
-                        """, (worker_id, task_description.value))
-                        
-                        # Generate performance prediction
-                        import random
-                        hours_worked = random.uniform(4, 8)
-                        tasks_completed = worker['tasks_completed']
-                        efficiency_rate = random.uniform(70, 95)
-                        predicted_score = (efficiency_rate + worker['performance_score']) / 2
-                        confidence_score = random.uniform(80, 95)
-                        
-                        db.execute_query("""
+                        """, (worker_id, task_description.value)),
+                        ("""
                             INSERT INTO performance_predictions 
                             (worker_id, hours_worked, tasks_completed, efficiency_rate, 
                              predicted_score, confidence_score)
-                            VALUES (%s, %s, %s, %s, %s, %s)
+                            SELECT id, %s, tasks_completed, %s, (%s + performance_score) / 2, %s
+                            FROM workers
+                            WHERE id = %s
                         """, (
-                            worker_id,
                             hours_worked,
-                            tasks_completed,
                             efficiency_rate,
-                            predicted_score,
-                            confidence_score
-                        ))
-                        
-                        # Update worker's task count
-                        db.execute_query("""
+                            efficiency_rate,
+                            confidence_score,
+                            worker_id
+                        )),
+                        ("""
                             UPDATE workers 
                             SET tasks_to_complete = tasks_to_complete + 1
                             WHERE id = %s
                         """, (worker_id,))
-                        
-                        # Commit transaction
-                        db.execute_query("COMMIT")
-                        
-                        # Refresh workers table
-                        workers_table = load_workers()
-                        workers_section.content = workers_table
-                        
-                        # Clear task form
-                        task_description.value = ""
-                        page.update()
-                        
-                    except Exception as e:
-                        # Rollback transaction on error
-                        db.execute_query("ROLLBACK")
-                        raise e
+                    ])
+                    invalidate("worker_rows")
+                    
+                    # Refresh workers table
+                    workers_section.content = load_workers()
+                    
+                    # Clear task form
+                    task_description.value = ""
+                    page.update(workers_section, task_description)
                     
                 except Exception as e:
                     logger.error(f"Error adding task: {str(e)}")
@@ -1100,96 +1329,73 @@ def main(page: ft.Page):
                 shadow=ft.BoxShadow(
                     spread_radius=1,
                     blur_radius=15,
-                    color=colors.with_opacity(0.1, colors.BLACK),
+                    color=_SHADOW_BLACK_10,
                 )
             )
             
-            return ft.Container(
-                content=ft.ListView(
-                    controls=[
-                        ft.Text("Developer Management", size=30, weight=ft.FontWeight.BOLD),
-                        ft.Container(
-                            content=ft.Card(
-                                content=ft.Container(
-                                    content=ft.Column([
-                                        ft.Text("Add/Edit Developer", size=20, weight=ft.FontWeight.BOLD),
-                                        ft.Row([name_field, role_field], spacing=20),
-                                        ft.Row([status_dropdown, performance_field], spacing=20),
-                                        ft.Row([
-                                            ft.ElevatedButton(
-                                                "Submit",
-                                                icon=ft.Icons.SAVE,
-                                                on_click=submit_worker,
-                                                style=ft.ButtonStyle(
-                                                    color=colors.WHITE,
-                                                    bgcolor=colors.BLUE,
-                                                    shape=ft.RoundedRectangleBorder(radius=10)
-                                                )
-                                            ),
-                                            ft.ElevatedButton(
-                                                "Clear",
-                                                icon=ft.Icons.CLEAR,
-                                                on_click=lambda e: clear_form(),
-                                                style=ft.ButtonStyle(
-                                                    color=colors.WHITE,
-                                                    bgcolor=colors.GREY,
-                                                    shape=ft.RoundedRectangleBorder(radius=10)
-                                                )
-                                            )
-                                        ], spacing=10)
-                                    ]),
-                                    padding=20
-                                ),
-                                elevation=2,
-                                shadow_color=colors.with_opacity(0.1, colors.BLACK)
-                            ),
-                            padding=20,
-                            bgcolor=colors.WHITE,
-                            border_radius=10,
-                            shadow=ft.BoxShadow(
-                                spread_radius=1,
-                                blur_radius=15,
-                                color=colors.with_opacity(0.1, colors.BLACK),
-                            )
-                        ),
-                        ft.Container(
-                            content=ft.Card(
-                                content=ft.Container(
-                                    content=ft.Column([
-                                        ft.Text("Assign Feature", size=20, weight=ft.FontWeight.BOLD),
-                                        ft.Row([task_worker_dropdown, task_description], spacing=20),
-                                        ft.ElevatedButton(
-                                            "Assign Feature",
-                                            icon=ft.Icons.ADD_TASK,
-                                            on_click=submit_task,
-                                            style=ft.ButtonStyle(
-                                                color=colors.WHITE,
-                                                bgcolor=colors.GREEN,
-                                                shape=ft.RoundedRectangleBorder(radius=10)
-                                            )
+            return ft.ListView(
+                controls=[
+                    ft.Text("Developer Management", size=30, weight=ft.FontWeight.BOLD),
+                    ft.Card(
+                        content=ft.Container(
+                            content=ft.Column([
+                                ft.Text("Add/Edit Developer", size=20, weight=ft.FontWeight.BOLD),
+                                ft.Row([name_field, role_field], spacing=20),
+                                ft.Row([status_dropdown, performance_field], spacing=20),
+                                ft.Row([
+                                    ft.ElevatedButton(
+                                        "Submit",
+                                        icon=ft.Icons.SAVE,
+                                        on_click=submit_worker,
+                                        style=ft.ButtonStyle(
+                                            color=colors.WHITE,
+                                            bgcolor=colors.BLUE,
+                                            shape=ft.RoundedRectangleBorder(radius=10)
                                         )
-                                    ]),
-                                    padding=20
-                                ),
-                                elevation=2,
-                                shadow_color=colors.with_opacity(0.1, colors.BLACK)
-                            ),
-                            padding=20,
-                            bgcolor=colors.WHITE,
-                            border_radius=10,
-                            shadow=ft.BoxShadow(
-                                spread_radius=1,
-                                blur_radius=15,
-                                color=colors.with_opacity(0.1, colors.BLACK),
-                            )
+                                    ),
+                                    ft.ElevatedButton(
+                                        "Clear",
+                                        icon=ft.Icons.CLEAR,
+                                        on_click=lambda e: clear_form(),
+                                        style=ft.ButtonStyle(
+                                            color=colors.WHITE,
+                                            bgcolor=colors.GREY,
+                                            shape=ft.RoundedRectangleBorder(radius=10)
+                                        )
+                                    )
+                                ], spacing=10)
+                            ]),
+                            padding=20
                         ),
-                        ft.Text("Developer List", size=20, weight=ft.FontWeight.BOLD),
-                        workers_section
-                    ],
-                    spacing=20,
-                    padding=20,
-                    expand=True
-                ),
+                        elevation=2,
+                        shadow_color=_SHADOW_BLACK_10
+                    ),
+                    ft.Card(
+                        content=ft.Container(
+                            content=ft.Column([
+                                ft.Text("Assign Feature", size=20, weight=ft.FontWeight.BOLD),
+                                ft.Row([task_worker_dropdown, task_description], spacing=20),
+                                ft.ElevatedButton(
+                                    "Assign Feature",
+                                    icon=ft.Icons.ADD_TASK,
+                                    on_click=submit_task,
+                                    style=ft.ButtonStyle(
+                                        color=colors.WHITE,
+                                        bgcolor=colors.GREEN,
+                                        shape=ft.RoundedRectangleBorder(radius=10)
+                                    )
+                                )
+                            ]),
+                            padding=20
+                        ),
+                        elevation=2,
+                        shadow_color=_SHADOW_BLACK_10
+                    ),
+                    ft.Text("Developer List", size=20, weight=ft.FontWeight.BOLD),
+                    workers_section
+                ],
+                spacing=20,
+                padding=20,
                 expand=True
             )
             
@@ -1245,7 +1451,7 @@ def main(page: ft.Page):
                         error_text.value = "Please fill in all fields"
                         error_text.visible = True
                         success_text.visible = False
-                        page.update()
+                        page.update(error_text, success_text)
                         return
                     
                     # Validate username
@@ -1254,7 +1460,7 @@ def main(page: ft.Page):
                         error_text.value = error
                         error_text.visible = True
                         success_text.visible = False
-                        page.update()
+                        page.update(error_text, success_text)
                         return
                     
                     # Validate email
@@ -1262,12 +1468,12 @@ def main(page: ft.Page):
                         error_text.value = "Invalid email format"
                         error_text.visible = True
                         success_text.visible = False
-                        page.update()
+                        page.update(error_text, success_text)
                         return
                     
                     # Check if username or email already exists (excluding current user)
                     existing_user = db.fetch_one(
-                        "SELECT * FROM users WHERE (username = %s OR email = %s) AND id != %s",
+                        "SELECT 1 FROM users WHERE (username = %s OR email = %s) AND id != %s LIMIT 1",
                         (new_username, new_email, user['id'])
                     )
                     
@@ -1275,7 +1481,7 @@ def main(page: ft.Page):
                         error_text.value = "Username or email already exists"
                         error_text.visible = True
                         success_text.visible = False
-                        page.update()
+                        page.update(error_text, success_text)
                         return
                     
                     # Update user information
@@ -1284,23 +1490,25 @@ def main(page: ft.Page):
                         (new_username, new_email, user['id'])
                     )
                     
-                    # Update current user
+                    # Update current user; the next visit rebuilds settings for
+                    # the new details
                     auth_view.current_user['username'] = new_username
                     auth_view.current_user['email'] = new_email
+                    invalidate_views(3)
                     
                     # Show success message
                     success_text.value = "Changes saved successfully"
                     success_text.visible = True
                     error_text.visible = False
                     
-                    page.update()
+                    page.update(error_text, success_text)
                     
                 except Exception as e:
                     logger.error(f"Error saving changes: {str(e)}")
                     error_text.value = "An error occurred while saving changes"
                     error_text.visible = True
                     success_text.visible = False
-                    page.update()
+                    page.update(error_text, success_text)
             
             # Create user info card
             user_info = ft.Card(
@@ -1338,7 +1546,7 @@ def main(page: ft.Page):
                     padding=20
                 ),
                 elevation=2,
-                shadow_color=colors.with_opacity(0.1, colors.BLACK)
+                shadow_color=_SHADOW_BLACK_10
             )
             
             # Create logout button
@@ -1357,6 +1565,8 @@ def main(page: ft.Page):
                 """Handle user logout"""
                 try:
                     auth_view.current_user = None
+                    # The next user must not see views built for this one
+                    invalidate_views()
                     page.go("/login")
                 except Exception as e:
                     logger.error(f"Logout error: {str(e)}")
@@ -1,7 +1,36 @@
+import re
 import flet as ft
 from flet_core import colors
 from database.db_connection import DatabaseConnection
 from ml_prediction.predictor import WorkerPredictor
+from utils.utils import cached, invalidate
+
+# Seconds the dropdown options and history rows are reused between refreshes
+PREDICTION_VIEW_TTL = 5
+
+# Accepted shapes of the form's numeric inputs, checked before converting
+_NUMBER_RES = {
+    int: re.compile(r'\d+'),
+    float: re.compile(r'\d+(\.\d*)?|\.\d+'),
+}
+
+def _parse_numeric(text, kind, label):
+    """
+    Parse a form value as kind (int or float) without raising
+    
+    Returns:
+        tuple: (ok, value, message) where message explains a rejected value
+    """
+    text = (text or "").strip()
+    if not text:
+        return False, None, f"{label} is required."
+    if not _NUMBER_RES[kind].fullmatch(text):
+        expected = "a whole number" if kind is int else "a number"
+        return False, None, f"{label} must be {expected}."
+    return True, kind(text), None
+
+# Score badge colors, indexed by how many of the 6 and 8 thresholds a score reaches
+SCORE_COLORS = (colors.RED, colors.ORANGE, colors.GREEN)
 
 def create_prediction_view(db: DatabaseConnection, page: ft.Page):
     """Create the prediction view"""
@@ -13,7 +42,7 @@ def create_prediction_view(db: DatabaseConnection, page: ft.Page):
         """Refresh prediction data"""
         worker_dropdown.options = get_worker_options()
         history_table.rows = get_prediction_rows()
-        page.update()
+        page.update(worker_dropdown, history_table)
 
     def create_prediction_form():
         # Form fields
@@ -51,30 +80,36 @@ def create_prediction_view(db: DatabaseConnection, page: ft.Page):
             on_click=lambda e: generate_prediction(e, worker_dropdown, hours_field, tasks_field, efficiency_field)
         )
         
-        return ft.Column([
+        form = ft.Column([
             ft.Text("Make Prediction", size=20, weight=ft.FontWeight.BOLD),
             ft.Row([worker_dropdown]),
             ft.Row([hours_field, tasks_field]),
             ft.Row([efficiency_field]),
             ft.Row([submit_button])
         ])
+        return form, worker_dropdown
 
     def create_results_section():
-        return ft.Column([
+        result_texts = {
+            'score': ft.Text("", size=16, weight=ft.FontWeight.BOLD),
+            'confidence': ft.Text("", size=16, weight=ft.FontWeight.BOLD),
+            'features': ft.Text("", size=16)
+        }
+        section = ft.Column([
             ft.Text("Prediction Results", size=20, weight=ft.FontWeight.BOLD),
             ft.Container(
                 content=ft.Column([
                     ft.Row([
                         ft.Text("Prediction Score:", size=16),
-                        ft.Text("", size=16, weight=ft.FontWeight.BOLD, id="prediction_score")
+                        result_texts['score']
                     ]),
                     ft.Row([
                         ft.Text("Confidence Score:", size=16),
-                        ft.Text("", size=16, weight=ft.FontWeight.BOLD, id="confidence_score")
+                        result_texts['confidence']
                     ]),
                     ft.Row([
                         ft.Text("Features Used:", size=16),
-                        ft.Text("", size=16, id="features_used")
+                        result_texts['features']
                     ])
                 ]),
                 padding=20,
@@ -82,6 +117,7 @@ def create_prediction_view(db: DatabaseConnection, page: ft.Page):
                 bgcolor=colors.SURFACE_VARIANT
             )
         ])
+        return section, result_texts
 
     def create_history_table():
         return ft.DataTable(
@@ -96,60 +132,95 @@ def create_prediction_view(db: DatabaseConnection, page: ft.Page):
             rows=get_prediction_rows()
         )
 
-    def get_worker_options():
+    def get_worker_options(worker_ids=None):
+        # Only the unfiltered list is shared through the cache
+        if worker_ids is not None:
+            return build_worker_options(worker_ids)
+        return cached("prediction_worker_options", PREDICTION_VIEW_TTL, build_worker_options)
+
+    def get_prediction_rows():
+        return cached("prediction_rows", PREDICTION_VIEW_TTL, build_prediction_rows)
+
+    # Options last built and the (id, name) pairs they were built from
+    worker_options = {'key': None, 'options': []}
+
+    def build_worker_options(worker_ids=None):
         try:
-            workers = db.fetch_all("SELECT id, name FROM workers WHERE status = 'active'")
-            return [
-                ft.dropdown.Option(str(worker['id']), worker['name'])
-                for worker in workers
-            ]
+            query = "SELECT id, name FROM workers WHERE status = 'active'"
+            if worker_ids is None:
+                workers = db.fetch_all(query)
+            else:
+                workers = db.fetch_all_in(query + " AND id IN ({ids})", worker_ids)
+            key = tuple((worker['id'], worker['name']) for worker in workers)
+            # Same workers as last time: keep the existing Option controls
+            if key != worker_options['key']:
+                worker_options['key'] = key
+                worker_options['options'] = [
+                    ft.dropdown.Option(str(worker_id), name)
+                    for worker_id, name in key
+                ]
+            return worker_options['options']
         except Exception as e:
             print(f"Error getting worker options: {e}")
             return []
 
-    def get_prediction_rows():
+    def build_prediction_rows():
         try:
-            predictions = db.fetch_all("""
-                SELECT p.*, w.name as worker_name 
+            predictions = db.fetch_tuples("""
+                SELECT w.name, p.hours_worked, p.tasks_completed, p.efficiency_rate,
+                       p.predicted_score, p.confidence_score
                 FROM performance_predictions p
                 JOIN workers w ON p.worker_id = w.id
                 ORDER BY p.created_at DESC
                 LIMIT 10
             """)
+            # Resolve the module attributes once rather than per row
+            DataRow, DataCell, Text, Container = ft.DataRow, ft.DataCell, ft.Text, ft.Container
+            white = colors.WHITE
+            score_colors = SCORE_COLORS
             return [
-                ft.DataRow(
+                DataRow(
                     cells=[
-                        ft.DataCell(ft.Text(pred['worker_name'])),
-                        ft.DataCell(ft.Text(str(pred['hours_worked']))),
-                        ft.DataCell(ft.Text(str(pred['tasks_completed']))),
-                        ft.DataCell(ft.Text(f"{pred['efficiency_rate']}%")),
-                        ft.DataCell(
-                            ft.Container(
-                                content=ft.Text(
-                                    f"{pred['predicted_score']:.1f}",
-                                    color=colors.WHITE
+                        DataCell(Text(name)),
+                        DataCell(Text(str(hours))),
+                        DataCell(Text(str(tasks))),
+                        DataCell(Text(f"{efficiency}%")),
+                        DataCell(
+                            Container(
+                                content=Text(
+                                    f"{score:.1f}",
+                                    color=white
                                 ),
-                                bgcolor=get_score_color(pred['predicted_score']),
+                                bgcolor=score_colors[(score >= 6) + (score >= 8)],
                                 padding=5,
                                 border_radius=5
                             )
                         ),
-                        ft.DataCell(ft.Text(f"{pred['confidence_score']:.1f}"))
+                        DataCell(Text(f"{confidence:.1f}"))
                     ]
-                ) for pred in predictions
+                ) for name, hours, tasks, efficiency, score, confidence in predictions
             ]
         except Exception as e:
             print(f"Error getting prediction rows: {e}")
             return []
 
     def generate_prediction(e, worker_dropdown, hours_field, tasks_field, efficiency_field):
+        # Get form data, stopping at the first value that doesn't parse
+        values = []
+        for text, kind, label in (
+            (worker_dropdown.value, int, "Worker"),
+            (hours_field.value, float, "Hours worked"),
+            (tasks_field.value, int, "Tasks completed"),
+            (efficiency_field.value, float, "Efficiency rate"),
+        ):
+            ok, value, message = _parse_numeric(text, kind, label)
+            if not ok:
+                page.show_snack_bar(ft.SnackBar(content=ft.Text(message)))
+                return
+            values.append(value)
+        worker_id, hours_worked, tasks_completed, efficiency_rate = values
+        
         try:
-            # Get form data
-            worker_id = int(worker_dropdown.value)
-            hours_worked = float(hours_field.value)
-            tasks_completed = int(tasks_field.value)
-            efficiency_rate = float(efficiency_field.value)
-            
             # Generate prediction
             prediction = predictor.predict_performance(
                 worker_id,
@@ -157,29 +228,24 @@ def create_prediction_view(db: DatabaseConnection, page: ft.Page):
                 tasks_completed,
                 efficiency_rate
             )
-            
-            # Update results
-            page.get_control("prediction_score").value = f"{prediction['predicted_score']:.1f}"
-            page.get_control("confidence_score").value = f"{prediction['confidence_score']:.1f}"
-            page.get_control("features_used").value = ", ".join(prediction['features_used'])
-            
-            # Refresh history table
-            history_table.rows = get_prediction_rows()
-            page.update()
-            
         except Exception as e:
             print(f"Error generating prediction: {e}")
             page.show_snack_bar(
                 ft.SnackBar(content=ft.Text("Error generating prediction. Please check the input data."))
             )
-
-    def get_score_color(score: float) -> str:
-        if score >= 8:
-            return colors.GREEN
-        elif score >= 6:
-            return colors.ORANGE
-        else:
-            return colors.RED
+            return
+        
+        # The new prediction is saved by now; drop the stale history
+        invalidate("prediction_rows")
+        
+        # Update results
+        result_texts['score'].value = f"{prediction['predicted_score']:.1f}"
+        result_texts['confidence'].value = f"{prediction['confidence_score']:.1f}"
+        result_texts['features'].value = ", ".join(prediction['features_used'])
+        
+        # Refresh history table
+        history_table.rows = get_prediction_rows()
+        page.update(*result_texts.values(), history_table)
 
     # Create header
     header = ft.Row([
@@ -192,10 +258,10 @@ def create_prediction_view(db: DatabaseConnection, page: ft.Page):
     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
 
     # Create prediction form
-    prediction_form = create_prediction_form()
+    prediction_form, worker_dropdown = create_prediction_form()
 
     # Create results section
-    results_section = create_results_section()
+    results_section, result_texts = create_results_section()
 
     # Create history table
     history_table = create_history_table()
@@ -1,17 +1,103 @@
 import pickle
 import os
+import json
 import numpy as np
 from typing import Dict, List, Optional, Union, Any
 from datetime import datetime, timedelta
 from database.db_connection import DatabaseConnection
 import logging
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 from utils.utils import log_error
-import joblib
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import Pipeline
-from sklearn.model_selection import train_test_split
-import pandas as pd
+
+# Aggregates feeding the model, one row per worker over the last 30 days
+FEATURES_QUERY = """
+    SELECT 
+        w.id as worker_id,
+        SUM(pp.hours_worked) as total_hours,
+        COUNT(t.id) as tasks_completed,
+        AVG(pp.efficiency_rate) as avg_efficiency,
+        AVG(CASE WHEN t.is_completed = 1 THEN 1 ELSE 0 END) as avg_completion
+    FROM workers w
+    LEFT JOIN performance_predictions pp ON w.id = pp.worker_id
+    LEFT JOIN tasks t ON w.id = t.worker_id
+    WHERE w.id IN ({ids})
+    AND pp.created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
+    GROUP BY w.id
+"""
+
+INSERT_PREDICTION_QUERY = """
+    INSERT INTO performance_predictions 
+    (worker_id, predicted_score, confidence_score, features_used, created_at)
+    VALUES (%s, %s, %s, %s, NOW())
+"""
+
+# Feature row used when a worker has no recent data
+DEFAULT_FEATURES = [0, 0, 0.5, 0.5]
+
+# Result returned when a prediction can't be made
+DEFAULT_PREDICTION = MappingProxyType({
+    'predicted_score': 5.0,
+    'confidence_scores': (0.5, 0.5),
+    'features_used': MappingProxyType({
+        'hours_worked': 0,
+        'tasks_completed': 0,
+        'efficiency_rate': 0.5,
+        'completion_rate': 0.5
+    }),
+    'feature_importances': None
+})
+
+# Weights of the fallback score, one per feature
+DEFAULT_WEIGHTS = (0.3, 0.3, 0.2, 0.2)
+
+def _score_and_confidence(row) -> tuple:
+    """
+    Compute the fallback score, feature completeness and stability of one
+    feature row in a single pass. Plain floats beat NumPy on four values,
+    where per-call dispatch costs more than the arithmetic.
+    
+    Args:
+        row: Sequence of the four feature values
+        
+    Returns:
+        tuple: (score, completeness, stability)
+    """
+    values = [float(v) for v in row]
+    n = len(values)
+    score = 0.0
+    positive = 0
+    total = 0.0
+    for value, weight in zip(values, DEFAULT_WEIGHTS):
+        score += value * weight
+        positive += value > 0
+        total += value
+    mean = total / n
+    variance = sum((v - mean) * (v - mean) for v in values) / n
+    return score * 10, positive / n, 1.0 - (variance ** 0.5) / 10
+
+_model_lock = threading.Lock()
+
+@lru_cache(maxsize=4)
+def _load_model_cached(path: str):
+    """Deserialize the model at path once per process and share it"""
+    import joblib
+    return joblib.load(path)
+
+def _shared_model(path: str):
+    """
+    Return the shared model stored at path, loading it on first use
+    
+    Args:
+        path: Path of the saved model
+        
+    Returns:
+        The deserialized model
+    """
+    # Views can open concurrently; keep two threads from both unpickling it
+    with _model_lock:
+        return _load_model_cached(path)
 
 class WorkerPredictor:
     def __init__(self, db: DatabaseConnection, model_path: str = "models/worker_model.pkl"):
@@ -24,8 +110,15 @@ class WorkerPredictor:
         """
         self.db = db
         self.model_path = model_path
+        # Create models directory if it doesn't exist
+        os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
+        # Compiled copy of the fitted model, used for inference when onnxruntime is installed
+        self.onnx_path = os.path.splitext(model_path)[0] + ".onnx"
         self.model = None
         self.scaler = None
+        self._session = None
+        # Feature importances of the fitted model as a list, or None
+        self._importances_list = None
         self.logger = logging.getLogger(__name__)
         self._load_model()
         
@@ -34,13 +127,12 @@ class WorkerPredictor:
         Load the model from disk. If no model exists, initialize a new one.
         """
         try:
-            # Create models directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-            
             if os.path.exists(self.model_path):
                 # Load existing model
                 self.logger.info(f"Loading model from {self.model_path}")
-                self.model = joblib.load(self.model_path)
+                self.model = _shared_model(self.model_path)
+                self._load_onnx_session()
+                self._cache_importances()
                 self.logger.info("Model loaded successfully")
             else:
                 # Initialize new model
@@ -57,6 +149,11 @@ class WorkerPredictor:
         Initialize a new model with default parameters
         """
         try:
+            # sklearn is imported on first use so app startup doesn't pay for it
+            from sklearn.ensemble import RandomForestRegressor
+            from sklearn.preprocessing import StandardScaler
+            from sklearn.pipeline import Pipeline
+            
             # Create a pipeline with preprocessing and model
             self.model = Pipeline([
                 ('scaler', StandardScaler()),
@@ -67,8 +164,9 @@ class WorkerPredictor:
                 ))
             ])
             
-            # Save the initialized model
+            # Save the initialized model; an ONNX copy of an older one no longer applies
             self.save_model()
+            self._discard_onnx()
             self.logger.info("New model initialized and saved")
             
         except Exception as e:
@@ -81,11 +179,12 @@ class WorkerPredictor:
         Save the current model to disk
         """
         try:
-            # Create models directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
-            
             # Save model using joblib
+            import joblib
             joblib.dump(self.model, self.model_path)
+            # Later predictors must pick up the file just written
+            with _model_lock:
+                _load_model_cached.cache_clear()
             self.logger.info(f"Model saved successfully to {self.model_path}")
             
         except Exception as e:
@@ -105,20 +204,30 @@ class WorkerPredictor:
             Dict containing training metrics
         """
         try:
+            from sklearn.base import clone
+            from sklearn.model_selection import train_test_split
+            
             # Split data into train and test sets
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.2, random_state=42
             )
             
-            # Train the model
-            self.model.fit(X_train, y_train)
+            # Train a fresh copy: self.model may be the pipeline shared
+            # through the load cache, and other predictors must not see
+            # it half-fitted
+            model = clone(self.model)
+            model.fit(X_train, y_train)
             
             # Calculate metrics
-            train_score = self.model.score(X_train, y_train)
-            test_score = self.model.score(X_test, y_test)
+            train_score = model.score(X_train, y_train)
+            test_score = model.score(X_test, y_test)
+            
+            self.model = model
             
             # Save the trained model
             self.save_model()
+            self._export_onnx()
+            self._cache_importances()
             
             metrics = {
                 'train_score': train_score,
@@ -134,6 +243,75 @@ class WorkerPredictor:
             self.logger.error(f"Error training model: {str(e)}")
             raise
 
+    def _cache_importances(self) -> None:
+        """Read the fitted model's feature importances once, for every prediction to share"""
+        regressor = getattr(self.model, 'named_steps', {}).get('regressor')
+        if hasattr(regressor, 'feature_importances_'):
+            self._importances_list = regressor.feature_importances_.tolist()
+        else:
+            self._importances_list = None
+
+    def _export_onnx(self) -> None:
+        """
+        Write the fitted model as ONNX next to the pickle and switch inference
+        to it. Without skl2onnx and onnxruntime the sklearn model keeps serving.
+        """
+        try:
+            from skl2onnx import convert_sklearn
+            from skl2onnx.common.data_types import FloatTensorType
+        except ImportError:
+            self._discard_onnx()
+            return
+        
+        try:
+            # The ONNX tree ensemble keeps thresholds and leaf values as float32,
+            # half the size of sklearn's float64 node arrays
+            onnx_model = convert_sklearn(self.model, initial_types=[('x', FloatTensorType([None, 4]))])
+            with open(self.onnx_path, 'wb') as f:
+                f.write(onnx_model.SerializeToString())
+            self._load_onnx_session()
+            
+        except Exception as e:
+            log_error(e, {'action': 'export_onnx', 'onnx_path': self.onnx_path})
+            self.logger.error(f"Error exporting model to ONNX: {str(e)}")
+            self._discard_onnx()
+
+    def _discard_onnx(self) -> None:
+        """Drop an ONNX copy that no longer matches the sklearn model"""
+        self._session = None
+        if os.path.exists(self.onnx_path):
+            os.remove(self.onnx_path)
+
+    def _load_onnx_session(self) -> None:
+        """Open an inference session on the ONNX model if there is one"""
+        self._session = None
+        if not os.path.exists(self.onnx_path):
+            return
+        
+        try:
+            import onnxruntime as ort
+            self._session = ort.InferenceSession(self.onnx_path, providers=['CPUExecutionProvider'])
+            
+        except ImportError:
+            return
+        except Exception as e:
+            log_error(e, {'action': 'load_onnx_session', 'onnx_path': self.onnx_path})
+            self.logger.error(f"Error loading ONNX model: {str(e)}")
+
+    def _predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Run the model on a feature matrix, through ONNX Runtime when available
+        
+        Args:
+            X: (N, 4) feature matrix
+            
+        Returns:
+            numpy array of N predicted scores
+        """
+        if self._session is not None:
+            return self._session.run(None, {'x': X.astype(np.float32)})[0].ravel()
+        return self.model.predict(X)
+
     def _get_worker_features(self, worker_id: int) -> np.ndarray:
         """
         Extract features for a worker from the database
@@ -144,41 +322,36 @@ class WorkerPredictor:
         Returns:
             numpy array of features
         """
-        try:
-            # Get worker's tasks from the last 30 days
-            query = """
-                SELECT 
-                    SUM(pp.hours_worked) as total_hours,
-                    COUNT(t.id) as tasks_completed,
-                    AVG(pp.efficiency_rate) as avg_efficiency,
-                    AVG(CASE WHEN t.is_completed = 1 THEN 1 ELSE 0 END) as avg_completion
-                FROM workers w
-                LEFT JOIN performance_predictions pp ON w.id = pp.worker_id
-                LEFT JOIN tasks t ON w.id = t.worker_id
-                WHERE w.id = %s
-                AND pp.created_at >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                GROUP BY w.id
-            """
-            result = self.db.fetch_one(query, (worker_id,))
-            
-            if not result:
-                # Return default values if no data
-                return np.array([[0, 0, 0.5, 0.5]])
-            
-            # Convert to numpy array
-            features = np.array([[
-                result['total_hours'] or 0,
-                result['tasks_completed'] or 0,
-                result['avg_efficiency'] or 0.5,
-                result['avg_completion'] or 0.5
-            ]])
+        return self._get_worker_features_bulk([worker_id])[worker_id]
+
+    def _get_worker_features_bulk(self, worker_ids: List[int]) -> Dict[int, np.ndarray]:
+        """
+        Extract features for several workers in a single query
+        
+        Args:
+            worker_ids: IDs of the workers
             
+        Returns:
+            Dictionary mapping worker ID to a (1, 4) numpy array of features
+        """
+        features = {worker_id: np.array([DEFAULT_FEATURES]) for worker_id in worker_ids}
+        if not worker_ids:
             return features
+        
+        try:
+            for result in self.db.fetch_all_in(FEATURES_QUERY, worker_ids):
+                features[result['worker_id']] = np.array([[
+                    result['total_hours'] or 0,
+                    result['tasks_completed'] or 0,
+                    result['avg_efficiency'] or 0.5,
+                    result['avg_completion'] or 0.5
+                ]])
             
         except Exception as e:
-            log_error(e, {'action': 'get_worker_features', 'worker_id': worker_id})
+            log_error(e, {'action': 'get_worker_features', 'worker_ids': worker_ids})
             self.logger.error(f"Error getting worker features: {str(e)}")
-            return np.array([[0, 0, 0.5, 0.5]])
+        
+        return features
 
     def predict_performance(self, worker_id: int) -> Dict[str, Union[float, List[float]]]:
         """
@@ -193,25 +366,22 @@ class WorkerPredictor:
         try:
             # Get worker features
             features = self._get_worker_features(worker_id)
+            fallback_score, completeness, stability = _score_and_confidence(features[0])
             
             # Make prediction
             if self.model is not None:
-                predicted_score = float(self.model.predict(features)[0])
-                # Get feature importances if available
-                if hasattr(self.model.named_steps['regressor'], 'feature_importances_'):
-                    importances = self.model.named_steps['regressor'].feature_importances_
-                else:
-                    importances = None
+                predicted_score = float(self._predict(features)[0])
+                importances = self._importances_list
             else:
                 # Fallback to default prediction
-                predicted_score = self._default_prediction(features)
+                predicted_score = fallback_score
                 importances = None
             
             # Ensure score is between 0 and 10
             predicted_score = max(0, min(10, predicted_score))
             
-            # Calculate confidence scores
-            confidence_scores = self._calculate_confidence_scores(features, predicted_score)
+            # Confidence from feature completeness and spread
+            confidence_scores = [completeness, stability]
             
             # Prepare features used
             features_used = {
@@ -228,7 +398,7 @@ class WorkerPredictor:
                 'predicted_score': predicted_score,
                 'confidence_scores': confidence_scores,
                 'features_used': features_used,
-                'feature_importances': importances.tolist() if importances is not None else None
+                'feature_importances': importances
             }
             
         except Exception as e:
@@ -236,6 +406,61 @@ class WorkerPredictor:
             self.logger.error(f"Error predicting performance: {str(e)}")
             return self._default_prediction_result(worker_id)
 
+    def predict_performance_bulk(self, worker_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Predict performance scores for several workers at once
+        
+        Args:
+            worker_ids: IDs of the workers
+            
+        Returns:
+            Dictionary mapping worker ID to its prediction results
+        """
+        if not worker_ids:
+            return {}
+        
+        try:
+            features_by_worker = self._get_worker_features_bulk(worker_ids)
+            X = np.vstack([features_by_worker[worker_id] for worker_id in worker_ids])
+            
+            fused = [_score_and_confidence(row) for row in X]
+            
+            # One predict call over the stacked matrix instead of one per worker
+            if self.model is not None:
+                scores = self._predict(X)
+                importances = self._importances_list
+            else:
+                scores = [score for score, _, _ in fused]
+                importances = None
+            
+            results = {}
+            rows = []
+            for i, worker_id in enumerate(worker_ids):
+                features = X[i:i + 1]
+                predicted_score = max(0, min(10, float(scores[i])))
+                confidence_scores = [fused[i][1], fused[i][2]]
+                features_used = {
+                    'hours_worked': float(features[0][0]),
+                    'tasks_completed': float(features[0][1]),
+                    'efficiency_rate': float(features[0][2]),
+                    'completion_rate': float(features[0][3])
+                }
+                rows.append((worker_id, predicted_score, confidence_scores, features_used))
+                results[worker_id] = {
+                    'predicted_score': predicted_score,
+                    'confidence_scores': confidence_scores,
+                    'features_used': features_used,
+                    'feature_importances': importances
+                }
+            
+            self._save_predictions_bulk(rows)
+            return results
+            
+        except Exception as e:
+            log_error(e, {'action': 'predict_performance_bulk', 'worker_ids': worker_ids})
+            self.logger.error(f"Error predicting performance: {str(e)}")
+            return {worker_id: self._default_prediction_result(worker_id) for worker_id in worker_ids}
+
     def _default_prediction(self, features: np.ndarray) -> float:
         """
         Fallback prediction logic using weighted average of features
@@ -246,8 +471,7 @@ class WorkerPredictor:
         Returns:
             float: Predicted score
         """
-        weights = np.array([0.3, 0.3, 0.2, 0.2])  # Weights for each feature
-        return float(np.sum(features * weights) * 10)  # Scale to 0-10
+        return _score_and_confidence(features[0])[0]
 
     def _calculate_confidence_scores(self, features: np.ndarray, predicted_score: float) -> List[float]:
         """
@@ -261,10 +485,9 @@ class WorkerPredictor:
             List of confidence scores
         """
         # Simple confidence calculation based on feature completeness
-        feature_completeness = np.mean(features > 0)
-        prediction_stability = 1.0 - (np.std(features) / 10)
+        _, feature_completeness, prediction_stability = _score_and_confidence(features[0])
         
-        return [float(feature_completeness), float(prediction_stability)]
+        return [feature_completeness, prediction_stability]
 
     def _save_prediction(self, worker_id: int, predicted_score: float, 
                         confidence_scores: List[float], features_used: Dict[str, float]) -> None:
@@ -278,16 +501,8 @@ class WorkerPredictor:
             features_used: Dictionary of features used
         """
         try:
-            query = """
-                INSERT INTO performance_predictions 
-                (worker_id, predicted_score, confidence_score, features_used, created_at)
-                VALUES (%s, %s, %s, %s, NOW())
-            """
-            self.db.execute_query(query, (
-                worker_id,
-                predicted_score,
-                confidence_scores[0],  # Use the first confidence score
-                str(features_used)
+            self.db.execute_query(INSERT_PREDICTION_QUERY, self._prediction_params(
+                worker_id, predicted_score, confidence_scores, features_used
             ))
             
         except Exception as e:
@@ -298,6 +513,39 @@ class WorkerPredictor:
             })
             self.logger.error(f"Error saving prediction: {str(e)}")
 
+    def _save_predictions_bulk(self, rows: List[tuple]) -> None:
+        """
+        Save several prediction results in one round-trip
+        
+        Args:
+            rows: (worker_id, predicted_score, confidence_scores, features_used) tuples
+        """
+        if not rows:
+            return
+        
+        try:
+            self.db.execute_many(INSERT_PREDICTION_QUERY, [
+                self._prediction_params(*row) for row in rows
+            ])
+            
+        except Exception as e:
+            log_error(e, {
+                'action': 'save_predictions_bulk',
+                'worker_ids': [row[0] for row in rows]
+            })
+            self.logger.error(f"Error saving predictions: {str(e)}")
+
+    @staticmethod
+    def _prediction_params(worker_id: int, predicted_score: float,
+                           confidence_scores: List[float], features_used: Dict[str, float]) -> tuple:
+        """Parameters of INSERT_PREDICTION_QUERY for one prediction"""
+        return (
+            worker_id,
+            predicted_score,
+            confidence_scores[0],  # Use the first confidence score
+            json.dumps(features_used, separators=(',', ':'))
+        )
+
     def get_prediction_history(self, worker_id: int, limit: int = 5) -> List[Dict]:
         """
         Get historical predictions for a worker
@@ -333,14 +581,9 @@ class WorkerPredictor:
         Returns:
             Dictionary with default prediction
         """
+        # Fresh copies of the nested values, so callers can't alter the template
         return {
-            'predicted_score': 5.0,
-            'confidence_scores': [0.5, 0.5],
-            'features_used': {
-                'hours_worked': 0,
-                'tasks_completed': 0,
-                'efficiency_rate': 0.5,
-                'completion_rate': 0.5
-            },
-            'feature_importances': None
+            **DEFAULT_PREDICTION,
+            'confidence_scores': list(DEFAULT_PREDICTION['confidence_scores']),
+            'features_used': dict(DEFAULT_PREDICTION['features_used'])
         } 
\ No newline at end of file
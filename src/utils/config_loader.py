@@ -1,9 +1,17 @@
 import json
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
+# config/config.json at the repository root
+_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'config', 'config.json')
+
+@lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from config.json and environment variables"""
+    """
+    Load configuration from config.json and environment variables.
+    Read once per process; callers share the returned dict, so treat it as read-only.
+    """
     load_dotenv()
     
     config = {
@@ -22,9 +30,8 @@ def load_config():
     }
     
     # Load additional config from config.json if it exists
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config', 'config.json')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
+    if os.path.exists(_CONFIG_PATH):
+        with open(_CONFIG_PATH, 'rb') as f:
             config.update(json.load(f))
             
-    return config 
\ No newline at end of file
+    return config 
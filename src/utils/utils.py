@@ -1,23 +1,38 @@
 import json
 from datetime import datetime, date
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 import re
 from decimal import Decimal
+from dataclasses import dataclass
 import logging
+import logging.handlers
 import os
-from functools import wraps
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
-)
+import queue
+import time
+import uuid
+import atexit
+import asyncio
+import random
+from functools import lru_cache, wraps
+
+try:
+    import orjson
+except ImportError:  # Optional: the stdlib json module is used without it
+    orjson = None
+
+# Background thread writing log records; started by setup_logging
+_log_listener = None
+
 logger = logging.getLogger(__name__)
 
+# In-process TTL cache: key -> (expires_at, value)
+_cache: Dict[str, tuple] = {}
+
+# Patterns used by the validators and sanitize_filename, compiled once
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_RE = re.compile(r'^\+?1?\d{9,15}$')
+_FILENAME_INVALID_RE = re.compile(r'[<>:"/\\|?*]')
+
 class ValidationError(Exception):
     """Custom exception for validation errors"""
     pass
@@ -26,12 +41,44 @@ class DataConversionError(Exception):
     """Custom exception for data conversion errors"""
     pass
 
-def validate_worker_data(data: Dict[str, Any]) -> bool:
+# Worker statuses, and how the validation error lists them
+VALID_STATUSES = frozenset({'active', 'inactive', 'on_leave'})
+_VALID_STATUSES_MSG = 'active, inactive, on_leave'
+
+# Bits of the numeric checks' violation mask
+SALARY_NEGATIVE = 1
+SCORE_OUT_OF_RANGE = 2
+
+def _as_float(value: Any) -> Optional[float]:
+    """Convert a form or row value to float, or None if it isn't a number"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+def _check_numerics(salary: float, score: float) -> int:
+    """Range-check a worker's salary and performance score, returning a violation mask"""
+    return (salary < 0) * SALARY_NEGATIVE | (not 0 <= score <= 10) * SCORE_OUT_OF_RANGE
+
+@dataclass(slots=True)
+class WorkerInput:
+    """A worker as entered in a form, in the column order of the workers table"""
+    name: str
+    position: str
+    salary: float
+    status: str
+    performance_score: float
+    
+    def as_row(self) -> tuple:
+        """Values in column order, ready to bind to an INSERT or UPDATE"""
+        return (self.name, self.position, self.salary, self.status, self.performance_score)
+
+def validate_worker_data(data: Union[Dict[str, Any], WorkerInput]) -> bool:
     """
     Validate worker data before saving to database
     
     Args:
-        data: Dictionary containing worker data
+        data: Dictionary or WorkerInput containing worker data
         
     Returns:
         bool: True if data is valid
@@ -39,41 +86,43 @@ def validate_worker_data(data: Dict[str, Any]) -> bool:
     Raises:
         ValidationError: If data is invalid
     """
-    required_fields = ['name', 'position', 'salary', 'status', 'performance_score']
-    
-    # Check required fields
-    for field in required_fields:
-        if field not in data:
-            raise ValidationError(f"Missing required field: {field}")
+    if isinstance(data, WorkerInput):
+        name, position, salary, status, score = data.as_row()
+    else:
+        required_fields = ['name', 'position', 'salary', 'status', 'performance_score']
+        
+        # Check required fields
+        for field in required_fields:
+            if field not in data:
+                raise ValidationError(f"Missing required field: {field}")
+        name, position, salary, status, score = (data[field] for field in required_fields)
     
     # Validate name
-    if not isinstance(data['name'], str) or len(data['name'].strip()) < 2:
+    if not isinstance(name, str) or len(name.strip()) < 2:
         raise ValidationError("Name must be a string with at least 2 characters")
     
     # Validate position
-    if not isinstance(data['position'], str) or len(data['position'].strip()) < 2:
+    if not isinstance(position, str) or len(position.strip()) < 2:
         raise ValidationError("Position must be a string with at least 2 characters")
     
     # Validate salary
-    try:
-        salary = float(data['salary'])
-        if salary < 0:
-            raise ValidationError("Salary cannot be negative")
-    except (ValueError, TypeError):
+    salary = _as_float(salary)
+    if salary is None:
         raise ValidationError("Salary must be a valid number")
+    score = _as_float(score)
+    violations = _check_numerics(salary, 0.0 if score is None else score)
+    if violations & SALARY_NEGATIVE:
+        raise ValidationError("Salary cannot be negative")
     
     # Validate status
-    valid_statuses = ['active', 'inactive', 'on_leave']
-    if data['status'] not in valid_statuses:
-        raise ValidationError(f"Status must be one of: {', '.join(valid_statuses)}")
+    if not isinstance(status, str) or status not in VALID_STATUSES:
+        raise ValidationError(f"Status must be one of: {_VALID_STATUSES_MSG}")
     
     # Validate performance score
-    try:
-        score = float(data['performance_score'])
-        if not (0 <= score <= 10):
-            raise ValidationError("Performance score must be between 0 and 10")
-    except (ValueError, TypeError):
+    if score is None:
         raise ValidationError("Performance score must be a valid number")
+    if violations & SCORE_OUT_OF_RANGE:
+        raise ValidationError("Performance score must be between 0 and 10")
     
     return True
 
@@ -119,14 +168,13 @@ def validate_prediction_data(data: Dict[str, Any]) -> bool:
     
     return True
 
-class DateTimeEncoder(json.JSONEncoder):
-    """Custom JSON encoder for datetime objects"""
-    def default(self, obj: Any) -> Any:
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
+def _json_default(obj: Any) -> Any:
+    """Serialize the types the JSON encoders don't handle themselves"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 def to_json(data: Any) -> str:
     """
@@ -142,7 +190,13 @@ def to_json(data: Any) -> str:
         DataConversionError: If conversion fails
     """
     try:
-        return json.dumps(data, cls=DateTimeEncoder)
+        if orjson is not None:
+            return orjson.dumps(
+                data,
+                default=_json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+        return json.dumps(data, default=_json_default)
     except Exception as e:
         raise DataConversionError(f"Error converting to JSON: {str(e)}")
 
@@ -160,22 +214,33 @@ def from_json(json_str: str) -> Any:
         DataConversionError: If conversion fails
     """
     try:
+        if orjson is not None:
+            return orjson.loads(json_str)
         return json.loads(json_str)
     except Exception as e:
         raise DataConversionError(f"Error converting from JSON: {str(e)}")
 
+# Bound format methods and the date layout, built once instead of per call
+_CURRENCY_FORMAT = "${:,.2f}".format
+_PERCENTAGE_FORMAT = "{:.1f}%".format
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 def format_currency(amount: float) -> str:
     """Format a number as currency"""
-    return f"${amount:,.2f}"
+    return _CURRENCY_FORMAT(amount)
 
 def format_percentage(value: float) -> str:
     """Format a number as percentage"""
-    return f"{value:.1f}%"
+    return _PERCENTAGE_FORMAT(value)
 
 def format_date(date: datetime) -> str:
     """Format a datetime object as a string"""
-    return date.strftime("%Y-%m-%d %H:%M:%S")
+    # isoformat gives the same text for naive datetimes and is faster than strftime
+    if type(date) is datetime and date.tzinfo is None:
+        return date.isoformat(' ', 'seconds')
+    return date.strftime(_DATE_FORMAT)
 
+@lru_cache(maxsize=1024)
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename to be safe for all operating systems
@@ -187,7 +252,7 @@ def sanitize_filename(filename: str) -> str:
         str: Sanitized filename
     """
     # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+    filename = _FILENAME_INVALID_RE.sub('', filename)
     # Replace spaces with underscores
     filename = filename.replace(' ', '_')
     return filename
@@ -199,8 +264,7 @@ def ensure_directory(directory: str) -> None:
     Args:
         directory: Directory path
     """
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
 
 def log_error(error: Exception, context: Optional[Dict[str, Any]] = None) -> None:
     """Log an error with context information"""
@@ -216,23 +280,28 @@ def log_error(error: Exception, context: Optional[Dict[str, Any]] = None) -> Non
         else:
             error_info["context"] = str(context)
     
-    logging.error(json.dumps(error_info))
+    logging.error(to_json(error_info))
+
+def _backoff(delay: float, attempt: int) -> float:
+    """Seconds to wait after a failed attempt: doubling per attempt, plus jitter"""
+    return delay * (2 ** attempt) + random.random() * 0.1
 
 def retry(max_attempts: int = 3, delay: float = 1.0):
     """
-    Decorator for retrying functions on failure
+    Decorator for retrying functions on failure, backing off exponentially
     
     Args:
         max_attempts: Maximum number of attempts
-        delay: Delay between attempts in seconds
+        delay: Delay before the first retry in seconds
         
     Returns:
         Callable: Decorated function
     """
+    last_attempt = max_attempts - 1
+    
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            import time
             last_error = None
             
             for attempt in range(max_attempts):
@@ -240,53 +309,136 @@ def retry(max_attempts: int = 3, delay: float = 1.0):
                     return func(*args, **kwargs)
                 except Exception as e:
                     last_error = e
-                    if attempt < max_attempts - 1:
-                        time.sleep(delay)
+                    if attempt < last_attempt:
+                        time.sleep(_backoff(delay, attempt))
+                        logger.warning(f"Retrying {func.__name__} (attempt {attempt + 1}/{max_attempts})")
+            
+            raise last_error
+        return wrapper
+    return decorator
+
+def async_retry(max_attempts: int = 3, delay: float = 1.0):
+    """
+    Decorator for retrying coroutines on failure without blocking the event loop
+    
+    Args:
+        max_attempts: Maximum number of attempts
+        delay: Delay before the first retry in seconds
+        
+    Returns:
+        Callable: Decorated coroutine function
+    """
+    last_attempt = max_attempts - 1
+    
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            last_error = None
+            
+            for attempt in range(max_attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    last_error = e
+                    if attempt < last_attempt:
+                        await asyncio.sleep(_backoff(delay, attempt))
                         logger.warning(f"Retrying {func.__name__} (attempt {attempt + 1}/{max_attempts})")
             
             raise last_error
         return wrapper
     return decorator
 
+def cached(key: str, ttl: float, fn: Callable[[], Any]) -> Any:
+    """
+    Return the cached value for key, calling fn to refresh it once ttl expires
+    
+    Args:
+        key: Cache key
+        ttl: Time to live in seconds
+        fn: Zero-argument callable producing the value
+        
+    Returns:
+        Any: Cached or freshly computed value
+    """
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    value = fn()
+    _cache[key] = (now + ttl, value)
+    return value
+
+def invalidate(*keys: str) -> None:
+    """Drop cached values so the next lookup hits the source again"""
+    for key in keys:
+        _cache.pop(key, None)
+
 def validate_email(email: str) -> bool:
     """Validate an email address"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 def validate_phone(phone: str) -> bool:
     """Validate a phone number"""
-    pattern = r'^\+?1?\d{9,15}$'
-    return bool(re.match(pattern, phone))
+    return bool(_PHONE_RE.match(phone))
 
+@lru_cache(maxsize=1024)
 def get_file_extension(filename: str) -> str:
     """Get the extension of a file"""
-    return filename.split('.')[-1].lower() if '.' in filename else ''
+    _, sep, extension = filename.rpartition('.')
+    return extension.lower() if sep else ''
 
-def is_valid_file_type(filename: str, allowed_extensions: list) -> bool:
-    """Check if a file has an allowed extension"""
+def is_valid_file_type(filename: str, allowed_extensions) -> bool:
+    """Check if a file has an allowed extension; pass a frozenset to skip the conversion"""
+    if not isinstance(allowed_extensions, (set, frozenset)):
+        allowed_extensions = frozenset(allowed_extensions)
     return get_file_extension(filename) in allowed_extensions
 
 def generate_unique_id() -> str:
     """Generate a unique ID"""
-    import uuid
     return str(uuid.uuid4())
 
 def truncate_text(text: str, max_length: int = 100) -> str:
     """Truncate text to a maximum length"""
-    return text[:max_length] + '...' if len(text) > max_length else text
+    if len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}..."
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
 
 def format_file_size(size_in_bytes: int) -> str:
     """Format file size in bytes to human readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_in_bytes < 1024.0:
-            return f"{size_in_bytes:.1f} {unit}"
-        size_in_bytes /= 1024.0
-    return f"{size_in_bytes:.1f} PB"
+    if not isinstance(size_in_bytes, int) or size_in_bytes < 1024:
+        # Floats and small sizes: the integer unit shortcut doesn't apply
+        for unit in _SIZE_UNITS[:-1]:
+            if size_in_bytes < 1024.0:
+                return f"{size_in_bytes:.1f} {unit}"
+            size_in_bytes /= 1024.0
+        return f"{size_in_bytes:.1f} PB"
+    # Each unit is 2**10 of the one before, so the unit index follows from the bit length
+    index = min((size_in_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_in_bytes / (1 << (index * 10)):.1f} {_SIZE_UNITS[index]}"
 
 def setup_logging():
-    """Configure logging for the application"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    ) 
\ No newline at end of file
+    """
+    Configure logging for the application. Callers only put records on a
+    queue, and a background listener thread does the file and console writes.
+    Runs once; later calls do nothing, and until the first one nothing opens app.log.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    log_queue = queue.Queue(-1)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler('app.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # The listener's handlers apply the real format; keep the queued message bare
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    _log_listener.start()
+    # Flush whatever is still queued on shutdown
+    atexit.register(_log_listener.stop)
@@ -1,15 +1,120 @@
+import atexit
+import threading
 import flet as ft
 from flet_core import colors
 from database.db_connection import DatabaseConnection
-from utils.utils import validate_worker_data, format_currency
+from utils.utils import validate_worker_data, format_currency, invalidate, log_error, WorkerInput
+
+# Status badge colors, looked up once per row
+_STATUS_COLORS = {
+    'active': colors.GREEN,
+    'inactive': colors.RED,
+    'on_leave': colors.ORANGE
+}
+_DEFAULT_STATUS_COLOR = colors.GREY
+
+# Workers shown per page of the table
+WORKER_PAGE_SIZE = 50
+
+# Seconds a table refresh waits so that quick successive edits share one reload
+REFRESH_DEBOUNCE = 0.15
+
+INSERT_WORKER_QUERY = """
+    INSERT INTO workers (name, position, salary, status, performance_score)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+UPDATE_WORKER_QUERY = """
+    UPDATE workers 
+    SET name = %s, position = %s, salary = %s, status = %s, performance_score = %s
+    WHERE id = %s
+"""
+INSERT_ACTIVITY_QUERY = """
+    INSERT INTO activities (worker_id, description, activity_type, worker_name)
+    VALUES (%s, %s, %s, %s)
+"""
+
+# Activity rows waiting to be written in one batch, flushed after
+# ACTIVITY_FLUSH_DELAY seconds or once ACTIVITY_FLUSH_SIZE have queued up
+ACTIVITY_FLUSH_DELAY = 0.5
+ACTIVITY_FLUSH_SIZE = 50
+_activity_buffer = []
+_activity_lock = threading.Lock()
+_activity_timer = None
+# Connection the next flush writes through: the one given by the most recent
+# log_activity call, so the timer never holds on to a replaced connection
+_activity_db = None
+
+def log_activity(db: DatabaseConnection, worker_id, description: str, activity_type: str, worker_name: str) -> None:
+    """Queue an activity row; it is written with the next batch"""
+    global _activity_timer, _activity_db
+    with _activity_lock:
+        _activity_db = db
+        _activity_buffer.append((worker_id, description, activity_type, worker_name))
+        if len(_activity_buffer) < ACTIVITY_FLUSH_SIZE:
+            if _activity_timer is None:
+                _activity_timer = threading.Timer(ACTIVITY_FLUSH_DELAY, flush_activities)
+                _activity_timer.daemon = True
+                _activity_timer.start()
+            return
+    flush_activities()
+
+def flush_activities() -> None:
+    """Write every queued activity row with a single executemany"""
+    global _activity_timer
+    with _activity_lock:
+        rows = _activity_buffer[:]
+        _activity_buffer.clear()
+        db = _activity_db
+        if _activity_timer is not None:
+            _activity_timer.cancel()
+            _activity_timer = None
+    if not rows:
+        return
+    try:
+        db.execute_many(INSERT_ACTIVITY_QUERY, rows)
+    except Exception:
+        # The batch is one multi-row INSERT, so a single bad row fails all of
+        # it; write the rows one by one so only the bad ones are lost
+        for row in rows:
+            try:
+                db.execute_query(INSERT_ACTIVITY_QUERY, row)
+            except Exception as e:
+                log_error(e, {'action': 'flush_activities', 'worker_id': row[0]})
+    invalidate("recent_activities")
+
+# The flush timer is a daemon thread, so write whatever is still queued
+# when the app exits
+atexit.register(flush_activities)
 
 def create_worker_view(db: DatabaseConnection, page: ft.Page):
     """Create the worker management view"""
     
     def refresh_data(e):
         """Refresh worker data"""
-        worker_table.rows = get_worker_rows()
-        page.update()
+        schedule_refresh()
+
+    # Pending debounced refresh; one lock guards the timer, the other keeps
+    # two reloads from overlapping without making the UI thread wait on a query
+    refresh_state = {'timer': None}
+    timer_lock = threading.Lock()
+    reload_lock = threading.Lock()
+
+    def schedule_refresh():
+        """Reload the table off the UI thread once edits pause for REFRESH_DEBOUNCE"""
+        with timer_lock:
+            if refresh_state['timer'] is not None:
+                refresh_state['timer'].cancel()
+            timer = threading.Timer(REFRESH_DEBOUNCE, run_refresh)
+            timer.daemon = True
+            refresh_state['timer'] = timer
+            timer.start()
+
+    def run_refresh():
+        with reload_lock:
+            worker_table.rows = get_worker_rows()
+            # The view may have been closed while the query ran
+            if worker_table.page is not None:
+                page.update(worker_table, prev_button, page_label, next_button)
 
     def create_worker_form():
         # Form fields
@@ -70,96 +175,110 @@ def create_worker_view(db: DatabaseConnection, page: ft.Page):
             ft.Row([submit_button, clear_button])
         ])
 
-    def get_worker_rows():
-        try:
-            workers = db.fetch_all("SELECT * FROM workers ORDER BY name")
-            return [
-                ft.DataRow(
-                    cells=[
-                        ft.DataCell(ft.Text(worker['name'])),
-                        ft.DataCell(ft.Text(worker['position'])),
-                        ft.DataCell(ft.Text(format_currency(worker['salary']))),
-                        ft.DataCell(
-                            ft.Container(
-                                content=ft.Text(
-                                    worker['status'].title(),
-                                    color=colors.WHITE
-                                ),
-                                bgcolor=get_status_color(worker['status']),
-                                padding=5,
-                                border_radius=5
-                            )
+    # Current page of the table, and the rows last built for it keyed by
+    # worker id as (row data, DataRow) so unchanged rows are reused
+    page_state = {'index': 0}
+    row_cache = {}
+
+    def build_worker_row(worker):
+        return ft.DataRow(
+            cells=[
+                ft.DataCell(ft.Text(worker['name'])),
+                ft.DataCell(ft.Text(worker['position'])),
+                ft.DataCell(ft.Text(format_currency(worker['salary']))),
+                ft.DataCell(
+                    ft.Container(
+                        content=ft.Text(
+                            worker['status'].title(),
+                            color=colors.WHITE
+                        ),
+                        bgcolor=_STATUS_COLORS.get(worker['status'], _DEFAULT_STATUS_COLOR),
+                        padding=5,
+                        border_radius=5
+                    )
+                ),
+                ft.DataCell(ft.Text(f"{worker['performance_score']:.1f}")),
+                ft.DataCell(
+                    ft.Row([
+                        ft.IconButton(
+                            icon=ft.Icons.EDIT,
+                            icon_color=colors.BLUE,
+                            tooltip="Edit",
+                            data=worker['id'],
+                            on_click=lambda e, w=worker: edit_worker(e, w, name_field, position_field, salary_field, status_dropdown, performance_field, submit_button)
                         ),
-                        ft.DataCell(ft.Text(f"{worker['performance_score']:.1f}")),
-                        ft.DataCell(
-                            ft.Row([
-                                ft.IconButton(
-                                    icon=ft.Icons.EDIT,
-                                    icon_color=colors.BLUE,
-                                    tooltip="Edit",
-                                    data=worker['id'],
-                                    on_click=lambda e, w=worker: edit_worker(e, w, name_field, position_field, salary_field, status_dropdown, performance_field, submit_button)
-                                ),
-                                ft.IconButton(
-                                    icon=ft.Icons.DELETE,
-                                    icon_color=colors.RED,
-                                    tooltip="Delete",
-                                    data=worker['id'],
-                                    on_click=lambda e, w=worker: delete_worker(e, w)
-                                )
-                            ])
+                        ft.IconButton(
+                            icon=ft.Icons.DELETE,
+                            icon_color=colors.RED,
+                            tooltip="Delete",
+                            data=worker['id'],
+                            on_click=lambda e, w=worker: delete_worker(e, w)
                         )
-                    ]
-                ) for worker in workers
+                    ])
+                )
             ]
+        )
+
+    def get_worker_rows():
+        try:
+            # One row past the page tells whether a next page exists
+            workers = db.fetch_all("""
+                SELECT id, name, position, salary, status, performance_score
+                FROM workers
+                ORDER BY name
+                LIMIT %s OFFSET %s
+            """, (WORKER_PAGE_SIZE + 1, page_state['index'] * WORKER_PAGE_SIZE), prepared=True)
+            if not workers and page_state['index'] > 0:
+                # The last page emptied out; show the one before it
+                page_state['index'] -= 1
+                return get_worker_rows()
+            
+            has_next = len(workers) > WORKER_PAGE_SIZE
+            rows = {}
+            for worker in workers[:WORKER_PAGE_SIZE]:
+                key = tuple(worker.values())
+                cached_row = row_cache.get(worker['id'])
+                if cached_row is None or cached_row[0] != key:
+                    cached_row = (key, build_worker_row(worker))
+                rows[worker['id']] = cached_row
+            row_cache.clear()
+            row_cache.update(rows)
+            
+            prev_button.disabled = page_state['index'] == 0
+            next_button.disabled = not has_next
+            page_label.value = f"Page {page_state['index'] + 1}"
+            return [row for _, row in rows.values()]
         except Exception as e:
             print(f"Error getting worker rows: {e}")
             return []
 
-    def get_status_color(status: str) -> str:
-        colors = {
-            'active': colors.GREEN,
-            'inactive': colors.RED,
-            'on_leave': colors.ORANGE
-        }
-        return colors.get(status, colors.GREY)
+    def change_page(step):
+        page_state['index'] += step
+        schedule_refresh()
 
     def submit_worker(e, name_field, position_field, salary_field, status_dropdown, performance_field):
         try:
             # Get form data
-            worker_data = {
-                'name': name_field.value,
-                'position': position_field.value,
-                'salary': float(salary_field.value.replace('$', '').replace(',', '')),
-                'status': status_dropdown.value,
-                'performance_score': float(performance_field.value)
-            }
+            worker_data = WorkerInput(
+                name=name_field.value,
+                position=position_field.value,
+                salary=float(salary_field.value.replace('$', '').replace(',', '')),
+                status=status_dropdown.value,
+                performance_score=float(performance_field.value)
+            )
             
             # Validate data
             if validate_worker_data(worker_data):
                 # Insert into database
-                query = """
-                    INSERT INTO workers (name, position, salary, status, performance_score)
-                    VALUES (%s, %s, %s, %s, %s)
-                """
-                db.execute_query(query, (
-                    worker_data['name'],
-                    worker_data['position'],
-                    worker_data['salary'],
-                    worker_data['status'],
-                    worker_data['performance_score']
-                ))
+                worker_id = db.execute_query(INSERT_WORKER_QUERY, worker_data.as_row(), prepared=True).lastrowid
                 
                 # Log activity
-                db.execute_query(
-                    "INSERT INTO activities (worker_id, description, type) VALUES (%s, %s, %s)",
-                    (db.lastrowid, f"Added new worker: {worker_data['name']}", "worker_added")
-                )
+                log_activity(db, worker_id, f"Added new worker: {worker_data.name}", "worker_added", worker_data.name)
+                invalidate("worker_stats")
                 
                 # Clear form and refresh table
                 clear_form(None, name_field, position_field, salary_field, status_dropdown, performance_field, submit_button)
-                worker_table.rows = get_worker_rows()
-                page.update()
+                schedule_refresh()
                 
         except Exception as e:
             print(f"Error submitting worker: {e}")
@@ -192,40 +311,25 @@ def create_worker_view(db: DatabaseConnection, page: ft.Page):
 
     def update_worker(e, worker_id, name_field, position_field, salary_field, status_dropdown, performance_field, submit_button):
         try:
-            worker_data = {
-                'name': name_field.value,
-                'position': position_field.value,
-                'salary': float(salary_field.value.replace('$', '').replace(',', '')),
-                'status': status_dropdown.value,
-                'performance_score': float(performance_field.value)
-            }
+            worker_data = WorkerInput(
+                name=name_field.value,
+                position=position_field.value,
+                salary=float(salary_field.value.replace('$', '').replace(',', '')),
+                status=status_dropdown.value,
+                performance_score=float(performance_field.value)
+            )
             
             if validate_worker_data(worker_data):
                 # Update database
-                query = """
-                    UPDATE workers 
-                    SET name = %s, position = %s, salary = %s, status = %s, performance_score = %s
-                    WHERE id = %s
-                """
-                db.execute_query(query, (
-                    worker_data['name'],
-                    worker_data['position'],
-                    worker_data['salary'],
-                    worker_data['status'],
-                    worker_data['performance_score'],
-                    worker_id
-                ))
+                db.execute_query(UPDATE_WORKER_QUERY, (*worker_data.as_row(), worker_id), prepared=True)
                 
                 # Log activity
-                db.execute_query(
-                    "INSERT INTO activities (worker_id, description, type) VALUES (%s, %s, %s)",
-                    (worker_id, f"Updated worker: {worker_data['name']}", "worker_updated")
-                )
+                log_activity(db, worker_id, f"Updated worker: {worker_data.name}", "worker_updated", worker_data.name)
+                invalidate("worker_stats")
                 
                 # Reset form and refresh table
                 clear_form(None, name_field, position_field, salary_field, status_dropdown, performance_field, submit_button)
-                worker_table.rows = get_worker_rows()
-                page.update()
+                schedule_refresh()
                 
         except Exception as e:
             print(f"Error updating worker: {e}")
@@ -238,18 +342,19 @@ def create_worker_view(db: DatabaseConnection, page: ft.Page):
             # Show confirmation dialog
             def confirm_delete(e):
                 try:
+                    # Write queued activities first: one still pointing at this
+                    # worker would fail its foreign key once the row is gone
+                    flush_activities()
+                    
                     # Delete worker
                     db.execute_query("DELETE FROM workers WHERE id = %s", (worker['id'],))
                     
-                    # Log activity
-                    db.execute_query(
-                        "INSERT INTO activities (worker_id, description, type) VALUES (%s, %s, %s)",
-                        (worker['id'], f"Removed worker: {worker['name']}", "worker_removed")
-                    )
+                    # Log activity; the worker row is gone, so only its name is kept
+                    log_activity(db, None, f"Removed worker: {worker['name']}", "worker_removed", worker['name'])
+                    invalidate("worker_stats")
                     
                     # Refresh table
-                    worker_table.rows = get_worker_rows()
-                    page.update()
+                    schedule_refresh()
                     
                     # Close dialog
                     dlg.open = False
@@ -309,6 +414,19 @@ def create_worker_view(db: DatabaseConnection, page: ft.Page):
     # Create worker form
     worker_form = create_worker_form()
 
+    # Create paging controls; get_worker_rows sets their state
+    prev_button = ft.IconButton(
+        icon=ft.Icons.CHEVRON_LEFT,
+        tooltip="Previous page",
+        on_click=lambda e: change_page(-1)
+    )
+    next_button = ft.IconButton(
+        icon=ft.Icons.CHEVRON_RIGHT,
+        tooltip="Next page",
+        on_click=lambda e: change_page(1)
+    )
+    page_label = ft.Text("Page 1")
+
     # Create worker table
     worker_table = ft.DataTable(
         columns=[
@@ -333,7 +451,10 @@ def create_worker_view(db: DatabaseConnection, page: ft.Page):
                 bgcolor=colors.SURFACE_VARIANT
             ),
             ft.Container(
-                content=worker_table,
+                content=ft.Column([
+                    worker_table,
+                    ft.Row([prev_button, page_label, next_button], alignment=ft.MainAxisAlignment.END)
+                ]),
                 padding=20,
                 border_radius=10,
                 bgcolor=colors.SURFACE_VARIANT